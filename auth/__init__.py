@@ -1,2 +1,5 @@
-from .utils import hash_password, verify_password, create_access_token, decode_access_token
-from .dependencies import get_current_user, security
+from .utils import hash_password, verify_password, password_needs_rehash, create_access_token, decode_access_token
+from .dependencies import (
+    get_current_user, get_current_user_id, get_optional_user, get_optional_user_id,
+    security, optional_security
+)
@@ -1,33 +1,57 @@
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from psycopg2.extras import RealDictCursor
 from typing import Optional
-from services.database import get_connection
+from services.database import get_cursor, execute_prepared
+from services.cache import get_cached_user, set_cached_user
 from .utils import decode_access_token
 
 security = HTTPBearer()
 optional_security = HTTPBearer(auto_error=False)
 
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
-    token = credentials.credentials
-    token_data = decode_access_token(token)
+def _fetch_user(user_id: int) -> Optional[dict]:
+    cached = get_cached_user(user_id)
+    if cached is not None:
+        return cached
 
-    if token_data is None:
+    with get_cursor(autocommit=True) as cursor:
+        execute_prepared(
+            cursor,
+            "user_by_id",
+            "SELECT id, email, name, phone, location, headline, summary, github, linkedin, created_at FROM users WHERE id = $1",
+            (user_id,)
+        )
+        user = cursor.fetchone()
+
+    if user is not None:
+        set_cached_user(user_id, user)
+    return user
+
+
+def _token_user_id(request: Request, credentials: Optional[HTTPAuthorizationCredentials]) -> Optional[int]:
+    """User id of the request's bearer token, as decoded by AuthMiddleware"""
+    if credentials is None:
+        return None
+    user_id = getattr(request.state, "user_id", None)
+    if user_id is None:
+        # Not decoded upstream (middleware missing or token rejected) - decode here
+        token_data = decode_access_token(credentials.credentials)
+        user_id = token_data.user_id if token_data is not None else None
+    return user_id
+
+
+# Declared as plain (sync) dependencies so FastAPI runs the DB lookup in its
+# threadpool instead of blocking the event loop
+def get_current_user(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
+    user_id = _token_user_id(request, credentials)
+
+    if user_id is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token"
         )
 
-    conn = get_connection()
-    cursor = conn.cursor(cursor_factory=RealDictCursor)
-    cursor.execute(
-        "SELECT id, email, name, phone, location, headline, summary, created_at FROM users WHERE id = %s",
-        (token_data.user_id,)
-    )
-    user = cursor.fetchone()
-    cursor.close()
-    conn.close()
+    user = _fetch_user(user_id)
 
     if user is None:
         raise HTTPException(
@@ -37,28 +61,34 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     return user
 
 
-async def get_optional_user(credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)) -> Optional[dict]:
+async def get_current_user_id(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)) -> int:
+    """
+    Authenticated user's id straight from the verified token, without loading
+    the user row. Use this for routes that only scope their queries by user.
+    """
+    user_id = _token_user_id(request, credentials)
+
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token"
+        )
+    return user_id
+
+
+def get_optional_user(request: Request, credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)) -> Optional[dict]:
     """
     Optional authentication - returns user if authenticated, None otherwise.
     Use this for endpoints that work with or without authentication.
     """
-    if credentials is None:
-        return None
+    user_id = _token_user_id(request, credentials)
 
-    token = credentials.credentials
-    token_data = decode_access_token(token)
-
-    if token_data is None:
+    if user_id is None:
         return None
 
-    conn = get_connection()
-    cursor = conn.cursor(cursor_factory=RealDictCursor)
-    cursor.execute(
-        "SELECT id, email, name, phone, location, headline, summary, created_at FROM users WHERE id = %s",
-        (token_data.user_id,)
-    )
-    user = cursor.fetchone()
-    cursor.close()
-    conn.close()
+    return _fetch_user(user_id)
 
-    return user
+
+async def get_optional_user_id(request: Request, credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)) -> Optional[int]:
+    """Optional authentication - returns the token's user id, or None if unauthenticated"""
+    return _token_user_id(request, credentials)
@@ -0,0 +1,28 @@
+from .utils import decode_access_token
+
+
+class AuthMiddleware:
+    """
+    Pure ASGI middleware that decodes the bearer token once per request,
+    before routing, and exposes the token's user id as `request.state.user_id`
+    (None when there is no valid token). Routes that only need the id read it
+    from there without a user lookup, and the rate limiter keys on it.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            user_id = None
+            for name, value in scope["headers"]:
+                if name == b"authorization":
+                    scheme, _, token = value.decode("latin-1").partition(" ")
+                    if scheme.lower() == "bearer" and token:
+                        token_data = decode_access_token(token)
+                        if token_data is not None:
+                            user_id = token_data.user_id
+                    break
+            scope.setdefault("state", {})["user_id"] = user_id
+
+        await self.app(scope, receive, send)
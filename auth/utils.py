@@ -1,39 +1,88 @@
-from datetime import datetime, timedelta
+from datetime import timedelta
 from typing import Optional
+import base64
+import hashlib
+import threading
+import time
 import jwt
 import bcrypt
-from core.config import JWT_SECRET_KEY, JWT_ALGORITHM, ACCESS_TOKEN_EXPIRE_HOURS
+from cachetools import TTLCache
+from core.config import get_settings
 from models.auth import TokenData
 
+_settings = get_settings()
+_JWT_ALGORITHMS = [_settings.jwt_algorithm]
+_TOKEN_LIFETIME = timedelta(hours=_settings.access_token_expire_hours)
+
+
+# bcrypt only reads the first 72 bytes of its input (and bcrypt 5 rejects
+# anything longer), so longer passwords are pre-hashed to a fixed 44-byte
+# base64 SHA-256 digest. Shorter ones go in unchanged, which keeps every
+# existing hash valid.
+_BCRYPT_MAX_BYTES = 72
+
+
+def _bcrypt_input(password: str) -> bytes:
+    encoded = password.encode('utf-8')
+    if len(encoded) > _BCRYPT_MAX_BYTES:
+        return base64.b64encode(hashlib.sha256(encoded).digest())
+    return encoded
+
 
 def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    return bcrypt.hashpw(_bcrypt_input(password), bcrypt.gensalt(rounds=_settings.bcrypt_rounds)).decode('utf-8')
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+    # checkpw compares in constant time; the cost comes from the rounds
+    # stored in the hash itself
+    return bcrypt.checkpw(_bcrypt_input(plain_password), hashed_password.encode('utf-8'))
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True if the hash was made with a cost other than the configured bcrypt_rounds"""
+    try:
+        rounds = int(hashed_password.split('$')[2])
+    except (IndexError, ValueError):
+        return True
+    return rounds != _settings.bcrypt_rounds
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
-    to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(hours=ACCESS_TOKEN_EXPIRE_HOURS)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
-    return encoded_jwt
+    expire = int(time.time() + (expires_delta or _TOKEN_LIFETIME).total_seconds())
+    # Build the claims in one dict; exp as a plain int saves PyJWT converting a datetime
+    return jwt.encode({**data, "exp": expire}, _settings.jwt_secret_key, algorithm=_settings.jwt_algorithm)
+
+
+# Verified tokens, keyed by a digest of the raw token -> (exp, TokenData).
+# Clients reuse the same bearer for its whole lifetime, so this skips the
+# HMAC check and payload parsing on repeat requests.
+_token_cache = TTLCache(maxsize=10_000, ttl=300)
+_token_cache_lock = threading.Lock()
 
 
 def decode_access_token(token: str) -> Optional[TokenData]:
+    cache_key = hashlib.blake2b(token.encode('utf-8'), digest_size=16).digest()
+    with _token_cache_lock:
+        cached = _token_cache.get(cache_key)
+    if cached is not None:
+        exp, token_data = cached
+        if exp > time.time():
+            return token_data
+
     try:
-        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+        payload = jwt.decode(token, _settings.jwt_secret_key, algorithms=_JWT_ALGORITHMS)
         user_id: int = payload.get("user_id")
         email: str = payload.get("email")
         if user_id is None:
             return None
-        return TokenData(user_id=user_id, email=email)
+        token_data = TokenData(user_id=user_id, email=email)
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
-        return None
\ No newline at end of file
+        return None
+
+    # Only successfully verified tokens are cached, and never past their exp
+    with _token_cache_lock:
+        _token_cache[cache_key] = (payload.get("exp", 0), token_data)
+    return token_data
\ No newline at end of file
@@ -1,9 +1,20 @@
-import os
-from dotenv import load_dotenv
+from functools import lru_cache
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
-load_dotenv()
 
-# JWT Settings
-JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-super-secret-key")
-JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
-ACCESS_TOKEN_EXPIRE_HOURS = int(os.getenv("ACCESS_TOKEN_EXPIRE_HOURS", "24"))
+class Settings(BaseSettings):
+    """Application settings, read from the environment (and .env) once"""
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore", frozen=True)
+
+    # JWT Settings
+    jwt_secret_key: str = "your-super-secret-key"
+    jwt_algorithm: str = "HS256"
+    access_token_expire_hours: int = 24
+
+    # Password hashing - each extra bcrypt round doubles the cost of a hash/verify
+    bcrypt_rounds: int = 11
+
+
+@lru_cache
+def get_settings() -> Settings:
+    return Settings()
@@ -1,16 +1,40 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi.errors import RateLimitExceeded
 
 from routers import auth, jobs, applications, dashboard, work_experience, education, skills, projects, resume, interview
 from services.rate_limiter import limiter, rate_limit_exceeded_handler
+from services.errors import NotFoundError, not_found_handler, internal_error_handler
+from services.database import init_pool, close_pool
+from auth.middleware import AuthMiddleware
 
-app = FastAPI(title="Interview AI API")
+# orjson encodes the datetime-heavy row lists much faster than stdlib json
+app = FastAPI(title="Interview AI API", default_response_class=ORJSONResponse)
+
+
+@app.on_event("startup")
+def open_db_pool():
+    init_pool()
+
+
+@app.on_event("shutdown")
+def close_db_pool():
+    close_pool()
 
 # Add rate limiter with custom CORS-aware handler
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
 
+# Services signal missing records with NotFoundError (a 404); any other
+# unhandled error becomes a logged, generic 500 (handlers let them propagate)
+app.add_exception_handler(NotFoundError, not_found_handler)
+app.add_exception_handler(Exception, internal_error_handler)
+
+# Decode the bearer token once per request (sets request.state.user_id).
+# Added before CORS so CORS stays outermost and answers preflights first
+app.add_middleware(AuthMiddleware)
+
 # Enable CORS for your frontend
 app.add_middleware(
     CORSMiddleware,
@@ -18,7 +42,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["X-Apply-Url", "X-Application-Id", "Content-Disposition"],
+    expose_headers=["X-Apply-Url", "X-Application-Id", "Content-Disposition", "X-Next-Cursor", "X-Total-Count"],
 )
 
 # Include all routers
@@ -41,4 +65,5 @@ def read_root():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # loop/http "auto" pick uvloop and httptools when installed (see requirements)
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="auto", http="auto")
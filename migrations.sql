@@ -56,4 +56,72 @@ CREATE TABLE IF NOT EXISTS skipped_jobs (
 );
 
 -- Create index for faster queries by user
-CREATE INDEX IF NOT EXISTS idx_skipped_jobs_user_id ON skipped_jobs(user_id);
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_skipped_jobs_user_id ON skipped_jobs(user_id);
+-- ============ USERS AUTH LOOKUP ============
+-- The per-request auth lookup (SELECT ... FROM users WHERE id = $1) is served
+-- by the primary key, and mostly by the user caches before it. Don't add a
+-- covering index for it: INCLUDEing summary/headline makes writes of long
+-- profiles fail the btree row size limit. Drop one left by an earlier run
+DROP INDEX IF EXISTS idx_users_auth_covering;
+DROP INDEX IF EXISTS idx_users_auth_covering_v2;
+
+-- ============ JOBS PAGINATION ============
+-- Serves GET /api/jobs (WHERE user_id = ? [AND id < ?] ORDER BY id DESC LIMIT ?)
+-- as a single index range scan
+CREATE INDEX IF NOT EXISTS idx_jobs_user_id_id ON jobs(user_id, id DESC);
+
+-- ============ JOBS FILTER SEARCH ============
+-- Trigram indexes so the GET /api/jobs company (ILIKE '%x%') and location
+-- (ILIKE 'x%') filters don't have to scan every row of the user's jobs
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_jobs_company_trgm ON jobs USING gin (company gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_jobs_location_trgm ON jobs USING gin (location gin_trgm_ops);
+
+-- ============ USERS EMAIL UNIQUENESS ============
+-- Registration relies on INSERT ... ON CONFLICT DO NOTHING to reject taken
+-- emails, so make sure the uniqueness is enforced by the database
+CREATE UNIQUE INDEX IF NOT EXISTS idx_users_email_unique ON users(email);
+
+-- ============ RESUME SECTION LISTS ============
+-- Each resume section is listed per user in a fixed order; these indexes
+-- match the ORDER BY of the list endpoints so rows come back pre-sorted
+-- from an index range scan instead of a scan plus sort
+CREATE INDEX IF NOT EXISTS idx_education_user_dates
+    ON education(user_id, end_date DESC NULLS FIRST, start_date DESC);
+CREATE INDEX IF NOT EXISTS idx_projects_user_dates
+    ON projects(user_id, end_date DESC NULLS FIRST, start_date DESC);
+CREATE INDEX IF NOT EXISTS idx_work_experiences_user_dates
+    ON work_experiences(user_id, is_current DESC, end_date DESC NULLS FIRST, start_date DESC);
+CREATE INDEX IF NOT EXISTS idx_skills_user_name ON skills(user_id, skill_name);
+
+-- ============ APPLICATIONS LISTING ============
+-- GET /api/applications filters by user (and optionally status) ordered by
+-- applied_date, or lists upcoming deadlines ordered by deadline
+CREATE INDEX IF NOT EXISTS idx_applications_user_status_applied
+    ON applications(user_id, status, applied_date DESC);
+CREATE INDEX IF NOT EXISTS idx_applications_user_deadline
+    ON applications(user_id, deadline) WHERE deadline IS NOT NULL;
+
+-- ============ USERS LOGIN LOOKUP ============
+-- Login matches emails case-insensitively; its unique lower(email) index is
+-- built CONCURRENTLY, which can't run inside a transaction, so it lives in
+-- migrations_concurrent.sql
+
+-- ============ JOBS LOOKUP BY job_id ============
+-- GET /api/jobs/{job_id} probes the primary key and job_id in separate
+-- UNION ALL branches; give the job_id branch its own index
+CREATE INDEX IF NOT EXISTS idx_jobs_job_id ON jobs(job_id);
+
+-- ============ PER-USER LOOKUPS (INTERVIEWS, HISTORY) ============
+-- The unfiltered applications list and the dashboard's this-week count go by
+-- applied_date without a status, which the (user_id, status, ...) index
+-- above can't order; interview sessions are counted per user, questions are
+-- listed per session in id order and status history per application in time
+-- order
+CREATE INDEX IF NOT EXISTS idx_applications_user_applied
+    ON applications(user_id, applied_date DESC);
+CREATE INDEX IF NOT EXISTS idx_interview_sessions_user_id ON interview_sessions(user_id);
+CREATE INDEX IF NOT EXISTS idx_interview_questions_session_id
+    ON interview_questions(session_id, id);
+CREATE INDEX IF NOT EXISTS idx_application_status_history_application
+    ON application_status_history(application_id, changed_at);
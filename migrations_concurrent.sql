@@ -0,0 +1,30 @@
+-- Index builds that must run OUTSIDE a transaction block: CREATE INDEX
+-- CONCURRENTLY errors inside one. Run this file after migrations.sql with
+-- plain `psql -f migrations_concurrent.sql` (no -1 / --single-transaction)
+
+-- ============ USERS LOGIN LOOKUP ============
+-- Login is case-insensitive: POST /api/auth/login matches
+-- WHERE lower(email) = lower(...), so "Jane@Example.com" and
+-- "jane@example.com" are the same account. This unique functional index
+-- serves that lookup and makes register's ON CONFLICT DO NOTHING reject
+-- emails differing only in case.
+--
+-- The build fails if existing rows already differ only in case, so check
+-- first. List the offending accounts with:
+--
+--   SELECT lower(email) AS email, array_agg(id ORDER BY id) AS user_ids
+--   FROM users GROUP BY lower(email) HAVING COUNT(*) > 1;
+--
+-- and merge or rename them (keeping the account the user actually logs in
+-- with) before re-running this file.
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM users GROUP BY lower(email) HAVING COUNT(*) > 1) THEN
+        RAISE EXCEPTION 'users has emails differing only in case; resolve them before building idx_users_email_lower';
+    END IF;
+END $$;
+
+-- CONCURRENTLY doesn't block writes to users while the index builds. If a
+-- build is interrupted it leaves an INVALID index behind that IF NOT EXISTS
+-- would skip; drop it (DROP INDEX CONCURRENTLY idx_users_email_lower) first
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS idx_users_email_lower ON users(lower(email));
@@ -21,8 +21,8 @@ class ApplicationCreate(BaseModel):
     job_url: Optional[str] = None
     job_description: Optional[str] = None
     status: Optional[str] = "applied"
-    deadline: Optional[str] = None
-    follow_up_date: Optional[str] = None
+    deadline: Optional[datetime] = None
+    follow_up_date: Optional[datetime] = None
     notes: Optional[str] = None
 
     @field_validator("status")
@@ -40,8 +40,8 @@ class ApplicationUpdate(BaseModel):
     job_url: Optional[str] = None
     job_description: Optional[str] = None
     status: Optional[str] = None
-    deadline: Optional[str] = None
-    follow_up_date: Optional[str] = None
+    deadline: Optional[datetime] = None
+    follow_up_date: Optional[datetime] = None
     notes: Optional[str] = None
 
     @field_validator("status")
@@ -68,9 +68,9 @@ class Application(BaseModel):
     job_url: Optional[str]
     job_description: Optional[str]
     status: str
-    applied_date: str
-    deadline: Optional[str]
-    follow_up_date: Optional[str]
+    applied_date: datetime
+    deadline: Optional[datetime]
+    follow_up_date: Optional[datetime]
     notes: Optional[str]
-    created_at: str
-    updated_at: str
+    created_at: datetime
+    updated_at: datetime
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from typing import Optional, List
-from datetime import date
+from datetime import date, datetime
 from .auth import User
 
 
@@ -23,15 +23,17 @@ class WorkExperienceUpdate(BaseModel):
 
 
 class WorkExperience(BaseModel):
+    # Rows saved from a parsed resume upload can lack fields the create
+    # models require, so everything the parser may leave NULL is Optional here
     id: int
     user_id: int
-    company: str
-    title: str
-    start_date: date
+    company: Optional[str]
+    title: Optional[str]
+    start_date: Optional[date]
     end_date: Optional[date]
-    is_current: bool
+    is_current: Optional[bool]
     responsibilities: Optional[str]
-    created_at: str
+    created_at: datetime
 
 
 class EducationCreate(BaseModel):
@@ -55,13 +57,13 @@ class EducationUpdate(BaseModel):
 class Education(BaseModel):
     id: int
     user_id: int
-    school: str
-    degree: str
+    school: Optional[str]
+    degree: Optional[str]
     field_of_study: Optional[str]
     start_date: Optional[date]
     end_date: Optional[date]
     gpa: Optional[str]
-    created_at: str
+    created_at: datetime
 
 
 class SkillCreate(BaseModel):
@@ -77,9 +79,9 @@ class SkillUpdate(BaseModel):
 class Skill(BaseModel):
     id: int
     user_id: int
-    skill_name: str
+    skill_name: Optional[str]
     proficiency: Optional[str]
-    created_at: str
+    created_at: datetime
 
 
 class ProjectCreate(BaseModel):
@@ -103,13 +105,13 @@ class ProjectUpdate(BaseModel):
 class Project(BaseModel):
     id: int
     user_id: int
-    title: str
+    title: Optional[str]
     description: Optional[str]
     technologies: Optional[str]
     url: Optional[str]
     start_date: Optional[date]
     end_date: Optional[date]
-    created_at: str
+    created_at: datetime
 
 
 class CompleteResume(BaseModel):
@@ -1,29 +1,77 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse, ORJSONResponse
 from typing import Optional, List
-from psycopg2.extras import RealDictCursor
-from services.database import get_connection
+from functools import lru_cache
+from psycopg2 import sql
+from services.database import get_cursor, iter_row_batches, json_array_chunks
 from models.application import ApplicationCreate, ApplicationUpdate, StatusHistoryEntry, VALID_STATUSES
-from auth.dependencies import get_current_user
+from auth.dependencies import get_current_user_id
 
 router = APIRouter(prefix="/api/applications", tags=["Applications"])
 
+APPLICATION_COLUMNS = (
+    "id, user_id, job_title, company, location, job_url, job_description, status, "
+    "applied_date, deadline, follow_up_date, notes, created_at, updated_at"
+)
+
+# Handlers doing blocking psycopg2 work are plain `def` so FastAPI runs them
+# in its threadpool instead of on the event loop
+
+
+@lru_cache(maxsize=None)
+def _update_application_sql(fields: tuple) -> sql.Composed:
+    """UPDATE statement for a given set of ApplicationUpdate fields, composed once per combination"""
+    assignments = sql.SQL(", ").join(
+        sql.SQL("{} = {}").format(sql.Identifier(field), sql.Placeholder(field))
+        for field in fields
+    )
+    if "status" not in fields:
+        return sql.SQL("""
+            UPDATE applications SET {assignments}, updated_at = CURRENT_TIMESTAMP
+            WHERE id = %(id)s AND user_id = %(user_id)s
+            RETURNING id
+        """).format(assignments=assignments)
+
+    # Status changes read the old status, update the row and log the change
+    # to history in one statement instead of three round trips
+    return sql.SQL("""
+        WITH old AS (
+            SELECT id, status FROM applications
+            WHERE id = %(id)s AND user_id = %(user_id)s
+            FOR UPDATE
+        ), updated AS (
+            UPDATE applications a SET {assignments}, updated_at = CURRENT_TIMESTAMP
+            FROM old
+            WHERE a.id = old.id
+            RETURNING a.id, old.status AS from_status, a.status AS to_status
+        ), history AS (
+            INSERT INTO application_status_history (application_id, from_status, to_status, notes)
+            SELECT id, from_status, to_status, %(history_notes)s FROM updated
+            WHERE from_status IS DISTINCT FROM to_status
+        )
+        SELECT id FROM updated
+    """).format(assignments=assignments)
+
 
 @router.post("", response_model=dict)
-async def create_application(application: ApplicationCreate, current_user: dict = Depends(get_current_user)):
+def create_application(application: ApplicationCreate, user_id: int = Depends(get_current_user_id)):
     """
     Create a new job application with job details (requires authentication)
     """
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        # Insert application with job details directly
+    with get_cursor(autocommit=True) as cursor:
+        # Insert application with job details and log its initial status
+        # to history in a single statement (one round trip)
         cursor.execute("""
-            INSERT INTO applications (user_id, job_title, company, location, job_url, job_description, status, deadline, follow_up_date, notes)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            RETURNING id
+            WITH new_application AS (
+                INSERT INTO applications (user_id, job_title, company, location, job_url, job_description, status, deadline, follow_up_date, notes)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                RETURNING id, status, notes
+            )
+            INSERT INTO application_status_history (application_id, from_status, to_status, notes)
+            SELECT id, NULL, status, notes FROM new_application
+            RETURNING application_id AS id
         """, (
-            current_user['id'],
+            user_id,
             application.job_title,
             application.company,
             application.location,
@@ -37,188 +85,84 @@ async def create_application(application: ApplicationCreate, current_user: dict
 
         result = cursor.fetchone()
 
-        # Log initial status to history
-        cursor.execute("""
-            INSERT INTO application_status_history (application_id, from_status, to_status, notes)
-            VALUES (%s, NULL, %s, %s)
-        """, (result['id'], application.status, application.notes))
-
-        conn.commit()
-        cursor.close()
-        conn.close()
+    return {"message": "Application created successfully", "id": result['id']}
 
-        return {"message": "Application created successfully", "id": result['id']}
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@router.get("", response_model=List[dict])
-async def get_applications(
+@router.get("")
+def get_applications(
     status: Optional[str] = None,
     upcoming_deadlines: Optional[bool] = False,
-    current_user: dict = Depends(get_current_user)
+    user_id: int = Depends(get_current_user_id)
 ):
     """
     Get current user's applications with optional filters (requires authentication)
     """
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        query = """
-            SELECT * FROM applications
-            WHERE user_id = %s
-        """
-        params = [current_user['id']]
-
-        if status:
-            query += " AND status = %s"
-            params.append(status)
-
-        if upcoming_deadlines:
-            query += " AND deadline IS NOT NULL AND deadline > NOW()"
-            query += " ORDER BY deadline ASC"
-        else:
-            query += " ORDER BY applied_date DESC"
+    query = f"""
+        SELECT {APPLICATION_COLUMNS} FROM applications
+        WHERE user_id = %s
+    """
+    params = [user_id]
 
-        cursor.execute(query, params)
-        applications = cursor.fetchall()
+    if status:
+        query += " AND status = %s"
+        params.append(status)
 
-        cursor.close()
-        conn.close()
+    if upcoming_deadlines:
+        query += " AND deadline IS NOT NULL AND deadline > NOW()"
+        query += " ORDER BY deadline ASC"
+    else:
+        query += " ORDER BY applied_date DESC"
 
-        return applications
+    # Stream the rows from a server-side cursor in batches instead of
+    # materializing the whole list. The first batch is fetched here so a
+    # failing query still turns into a 500 before any bytes are sent
+    batches = iter_row_batches(query, params)
+    first_batch = next(batches, [])
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return StreamingResponse(json_array_chunks(first_batch, batches), media_type="application/json")
 
 
 @router.get("/{application_id}")
-async def get_application(application_id: int, current_user: dict = Depends(get_current_user)):
+def get_application(application_id: int, user_id: int = Depends(get_current_user_id)):
     """
     Get a specific application (requires authentication, must be owner)
     """
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        cursor.execute("""
-            SELECT * FROM applications
+    with get_cursor(autocommit=True) as cursor:
+        cursor.execute(f"""
+            SELECT {APPLICATION_COLUMNS} FROM applications
             WHERE id = %s AND user_id = %s
-        """, (application_id, current_user['id']))
+        """, (application_id, user_id))
 
         application = cursor.fetchone()
 
-        cursor.close()
-        conn.close()
-
-        if not application:
-            raise HTTPException(status_code=404, detail="Application not found")
-
-        return application
+    if not application:
+        raise HTTPException(status_code=404, detail="Application not found")
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return application
 
 
 @router.put("/{application_id}")
 @router.patch("/{application_id}")
-async def update_application(application_id: int, update: ApplicationUpdate, current_user: dict = Depends(get_current_user)):
+def update_application(application_id: int, update: ApplicationUpdate, user_id: int = Depends(get_current_user_id)):
     """
     Update an application (requires authentication, must be owner)
     """
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        # Build dynamic update query
-        updates = []
-        params = []
-
-        if update.job_title is not None:
-            updates.append("job_title = %s")
-            params.append(update.job_title)
-
-        if update.company is not None:
-            updates.append("company = %s")
-            params.append(update.company)
-
-        if update.location is not None:
-            updates.append("location = %s")
-            params.append(update.location)
-
-        if update.job_url is not None:
-            updates.append("job_url = %s")
-            params.append(update.job_url)
-
-        if update.job_description is not None:
-            updates.append("job_description = %s")
-            params.append(update.job_description)
-
-        if update.status is not None:
-            updates.append("status = %s")
-            params.append(update.status)
-
-        if update.deadline is not None:
-            updates.append("deadline = %s")
-            params.append(update.deadline)
-
-        if update.follow_up_date is not None:
-            updates.append("follow_up_date = %s")
-            params.append(update.follow_up_date)
-
-        if update.notes is not None:
-            updates.append("notes = %s")
-            params.append(update.notes)
-
-        if not updates:
+    with get_cursor(autocommit=True) as cursor:
+        # Only fields that were sent (non-null) are updated; the SQL for each
+        # combination of fields is cached
+        values = update.model_dump(exclude_none=True)
+        if not values:
             raise HTTPException(status_code=400, detail="No fields to update")
 
-        updates.append("updated_at = CURRENT_TIMESTAMP")
-        params.extend([application_id, current_user['id']])
-
-        # If status is changing, get the old status first
-        old_status = None
-        if update.status is not None:
-            cursor.execute(
-                "SELECT status FROM applications WHERE id = %s AND user_id = %s",
-                (application_id, current_user['id'])
-            )
-            row = cursor.fetchone()
-            if not row:
-                raise HTTPException(status_code=404, detail="Application not found")
-            old_status = row['status']
-
-        query = f"UPDATE applications SET {', '.join(updates)} WHERE id = %s AND user_id = %s RETURNING id"
+        params = {**values, "id": application_id, "user_id": user_id, "history_notes": update.notes}
 
-        cursor.execute(query, params)
+        cursor.execute(_update_application_sql(tuple(values)), params)
         result = cursor.fetchone()
 
         if not result:
             raise HTTPException(status_code=404, detail="Application not found")
 
-        # Log status change to history
-        if update.status is not None and update.status != old_status:
-            cursor.execute("""
-                INSERT INTO application_status_history (application_id, from_status, to_status, notes)
-                VALUES (%s, %s, %s, %s)
-            """, (application_id, old_status, update.status, update.notes))
-
-        conn.commit()
-        cursor.close()
-        conn.close()
-
-        return {"message": "Application updated successfully"}
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return {"message": "Application updated successfully"}
 
 
 @router.get("/statuses", response_model=List[str])
@@ -228,96 +172,58 @@ async def get_valid_statuses():
 
 
 @router.get("/stats", response_model=dict)
-async def get_application_stats(current_user: dict = Depends(get_current_user)):
+def get_application_stats(user_id: int = Depends(get_current_user_id)):
     """Get a summary of applications grouped by status"""
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
+    with get_cursor(autocommit=True) as cursor:
+        # Per-status counts with the overall total riding along as a
+        # window over the groups - one scan, one round trip
         cursor.execute("""
-            SELECT status, COUNT(*) as count
+            SELECT status, COUNT(*) as count, SUM(COUNT(*)) OVER () as total
             FROM applications
             WHERE user_id = %s
             GROUP BY status
-        """, (current_user['id'],))
+        """, (user_id,))
         rows = cursor.fetchall()
 
-        cursor.execute("""
-            SELECT COUNT(*) as total FROM applications WHERE user_id = %s
-        """, (current_user['id'],))
-        total = cursor.fetchone()['total']
+    total = int(rows[0]['total']) if rows else 0
+    stats = {s: 0 for s in VALID_STATUSES}
+    for row in rows:
+        stats[row['status']] = row['count']
 
-        cursor.close()
-        conn.close()
-
-        stats = {s: 0 for s in VALID_STATUSES}
-        for row in rows:
-            stats[row['status']] = row['count']
-
-        return {"total": total, "by_status": stats}
-
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return {"total": total, "by_status": stats}
 
 
 @router.get("/{application_id}/history", response_model=List[StatusHistoryEntry])
-async def get_status_history(application_id: int, current_user: dict = Depends(get_current_user)):
+def get_status_history(application_id: int, user_id: int = Depends(get_current_user_id)):
     """Get the full status change history for an application"""
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        # Verify ownership
-        cursor.execute(
-            "SELECT id FROM applications WHERE id = %s AND user_id = %s",
-            (application_id, current_user['id'])
-        )
-        if not cursor.fetchone():
-            cursor.close()
-            conn.close()
-            raise HTTPException(status_code=404, detail="Application not found")
-
+    with get_cursor(autocommit=True) as cursor:
+        # Ownership check and history in one query: no rows means the
+        # application isn't the user's, a NULL h.id means no history yet
         cursor.execute("""
-            SELECT id, from_status, to_status, notes, changed_at
-            FROM application_status_history
-            WHERE application_id = %s
-            ORDER BY changed_at ASC
-        """, (application_id,))
-        history = cursor.fetchall()
-
-        cursor.close()
-        conn.close()
+            SELECT h.id, h.from_status, h.to_status, h.notes, h.changed_at
+            FROM applications a
+            LEFT JOIN application_status_history h ON h.application_id = a.id
+            WHERE a.id = %s AND a.user_id = %s
+            ORDER BY h.changed_at ASC
+        """, (application_id, user_id))
+        rows = cursor.fetchall()
 
-        return history
+    if not rows:
+        raise HTTPException(status_code=404, detail="Application not found")
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    # Trusted rows with exactly the StatusHistoryEntry columns; skip revalidation
+    return ORJSONResponse([row for row in rows if row['id'] is not None])
 
 
 @router.delete("/{application_id}")
-async def delete_application(application_id: int, current_user: dict = Depends(get_current_user)):
+def delete_application(application_id: int, user_id: int = Depends(get_current_user_id)):
     """
     Delete an application (requires authentication, must be owner)
     """
-    try:
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("DELETE FROM applications WHERE id = %s AND user_id = %s RETURNING id", (application_id, current_user['id']))
-        result = cursor.fetchone()
+    with get_cursor(dict_rows=False, autocommit=True) as cursor:
+        cursor.execute("DELETE FROM applications WHERE id = %s AND user_id = %s", (application_id, user_id))
 
-        if not result:
+        if cursor.rowcount == 0:
             raise HTTPException(status_code=404, detail="Application not found")
 
-        conn.commit()
-        cursor.close()
-        conn.close()
-
-        return {"message": "Application deleted successfully"}
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return {"message": "Application deleted successfully"}
@@ -1,110 +1,103 @@
 from fastapi import APIRouter, HTTPException, Depends, status, Request
-from psycopg2.extras import RealDictCursor
-from services.database import get_connection
-from services.rate_limiter import limiter
+from psycopg2 import sql
+from services.database import get_cursor, execute_prepared
+from services.rate_limiter import limiter, get_client_ip
+from services.cache import invalidate_user_cache
 from models.auth import UserCreate, UserLogin, UserUpdate
-from auth.utils import hash_password, verify_password, create_access_token
+from auth.utils import hash_password, verify_password, password_needs_rehash, create_access_token
 from auth.dependencies import get_current_user
 
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 
 
 @router.post("/register", response_model=dict)
-@limiter.limit("5/minute")  # 5 registrations per minute per IP
-async def register(request: Request, user: UserCreate):
+@limiter.limit("5/minute", key_func=get_client_ip)  # 5 registrations per minute per IP
+def register(request: Request, user: UserCreate):
     """Register a new user"""
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        # Check if email already exists
-        cursor.execute("SELECT id FROM users WHERE email = %s", (user.email,))
-        if cursor.fetchone():
-            cursor.close()
-            conn.close()
-            raise HTTPException(status_code=400, detail="Email already registered")
-
-        # Hash password and create user
-        hashed_password = hash_password(user.password)
+    # Sync handler: FastAPI runs it in the threadpool so bcrypt doesn't block the event loop
+    # Hash before borrowing a connection so bcrypt doesn't hold a pool slot
+    hashed_password = hash_password(user.password)
+
+    with get_cursor() as cursor:
+        # Insert and detect a taken email in one atomic statement; the
+        # unique email constraint makes a duplicate return no row
         cursor.execute("""
             INSERT INTO users (email, password_hash, name, phone, location)
             VALUES (%s, %s, %s, %s, %s)
+            ON CONFLICT DO NOTHING
             RETURNING id, email, name, phone, location
         """, (user.email, hashed_password, user.name, user.phone, user.location))
 
         new_user = cursor.fetchone()
-        conn.commit()
-        cursor.close()
-        conn.close()
 
-        # Create access token
-        access_token = create_access_token(
-            data={"user_id": new_user['id'], "email": new_user['email']}
-        )
+    if new_user is None:
+        raise HTTPException(status_code=400, detail="Email already registered")
 
-        return {
-            "message": "User registered successfully",
-            "access_token": access_token,
-            "token_type": "bearer",
-            "user": {
-                "id": new_user['id'],
-                "email": new_user['email'],
-                "name": new_user['name'],
-                "phone": new_user['phone'],
-                "location": new_user['location']
-            }
-        }
+    # Create access token
+    access_token = create_access_token(
+        data={"user_id": new_user['id'], "email": new_user['email']}
+    )
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return {
+        "message": "User registered successfully",
+        "access_token": access_token,
+        "token_type": "bearer",
+        "user": {
+            "id": new_user['id'],
+            "email": new_user['email'],
+            "name": new_user['name'],
+            "phone": new_user['phone'],
+            "location": new_user['location']
+        }
+    }
 
 
 @router.post("/login", response_model=dict)
-@limiter.limit("5/minute")  # 5 login attempts per minute per IP
-async def login(request: Request, credentials: UserLogin):
-    """Login and get access token"""
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        # Find user by email
-        cursor.execute(
-            "SELECT id, email, password_hash, name, phone, location FROM users WHERE email = %s",
+@limiter.limit("5/minute", key_func=get_client_ip)  # 5 login attempts per minute per IP
+def login(request: Request, credentials: UserLogin):
+    """Login and get access token (emails are matched case-insensitively)"""
+    # Sync handler: FastAPI runs it in the threadpool so bcrypt doesn't block the event loop
+    with get_cursor(autocommit=True) as cursor:
+        # Find user by email (case-insensitively; served by idx_users_email_lower)
+        execute_prepared(
+            cursor,
+            "user_by_email",
+            "SELECT id, email, password_hash, name, phone, location FROM users WHERE lower(email) = lower($1)",
             (credentials.email,)
         )
         user = cursor.fetchone()
-        cursor.close()
-        conn.close()
 
-        if not user or not verify_password(credentials.password, user['password_hash']):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Incorrect email or password",
+    if not user or not verify_password(credentials.password, user['password_hash']):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+        )
+
+    # Re-hash at the configured cost while we have the plain password, so
+    # hashes made with an older cost stop slowing every future login
+    if password_needs_rehash(user['password_hash']):
+        with get_cursor() as cursor:
+            cursor.execute(
+                "UPDATE users SET password_hash = %s WHERE id = %s",
+                (hash_password(credentials.password), user['id'])
             )
 
-        # Create access token
-        access_token = create_access_token(
-            data={"user_id": user['id'], "email": user['email']}
-        )
+    # Create access token
+    access_token = create_access_token(
+        data={"user_id": user['id'], "email": user['email']}
+    )
 
-        return {
-            "access_token": access_token,
-            "token_type": "bearer",
-            "user": {
-                "id": user['id'],
-                "email": user['email'],
-                "name": user['name'],
-                "phone": user['phone'],
-                "location": user['location']
-            }
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "user": {
+            "id": user['id'],
+            "email": user['email'],
+            "name": user['name'],
+            "phone": user['phone'],
+            "location": user['location']
         }
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    }
 
 
 @router.get("/me", response_model=dict)
@@ -124,65 +117,36 @@ async def get_me(current_user: dict = Depends(get_current_user)):
 
 
 @router.put("/profile", response_model=dict)
-async def update_profile(update_data: UserUpdate, current_user: dict = Depends(get_current_user)):
+def update_profile(update_data: UserUpdate, current_user: dict = Depends(get_current_user)):
     """Update current user's profile"""
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        # Build dynamic update query
-        update_fields = []
-        params = []
-
-        if update_data.name is not None:
-            update_fields.append("name = %s")
-            params.append(update_data.name)
-        if update_data.phone is not None:
-            update_fields.append("phone = %s")
-            params.append(update_data.phone)
-        if update_data.location is not None:
-            update_fields.append("location = %s")
-            params.append(update_data.location)
-        if update_data.headline is not None:
-            update_fields.append("headline = %s")
-            params.append(update_data.headline)
-        if update_data.summary is not None:
-            update_fields.append("summary = %s")
-            params.append(update_data.summary)
-        if update_data.github is not None:
-            update_fields.append("github = %s")
-            params.append(update_data.github)
-        if update_data.linkedin is not None:
-            update_fields.append("linkedin = %s")
-            params.append(update_data.linkedin)
-
-        if not update_fields:
-            return {"message": "No fields to update"}
-
-        params.append(current_user['id'])
-
-        query = f"UPDATE users SET {', '.join(update_fields)} WHERE id = %s RETURNING *"
+    # Only fields that were sent (non-null) are updated
+    values = update_data.model_dump(exclude_none=True)
+    if not values:
+        return {"message": "No fields to update"}
+
+    assignments = sql.SQL(", ").join(
+        sql.SQL("{} = %s").format(sql.Identifier(field)) for field in values
+    )
+    query = sql.SQL("UPDATE users SET {} WHERE id = %s RETURNING *").format(assignments)
+    params = [*values.values(), current_user['id']]
+
+    with get_cursor(autocommit=True) as cursor:
         cursor.execute(query, params)
         updated_user = cursor.fetchone()
 
-        conn.commit()
-        cursor.close()
-        conn.close()
-
-        return {
-            "message": "Profile updated successfully",
-            "user": {
-                "id": updated_user['id'],
-                "email": updated_user['email'],
-                "name": updated_user['name'],
-                "phone": updated_user.get('phone'),
-                "location": updated_user.get('location'),
-                "headline": updated_user.get('headline'),
-                "summary": updated_user.get('summary'),
-                "github": updated_user.get('github'),
-                "linkedin": updated_user.get('linkedin')
-            }
-        }
+    invalidate_user_cache(current_user['id'])
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return {
+        "message": "Profile updated successfully",
+        "user": {
+            "id": updated_user['id'],
+            "email": updated_user['email'],
+            "name": updated_user['name'],
+            "phone": updated_user.get('phone'),
+            "location": updated_user.get('location'),
+            "headline": updated_user.get('headline'),
+            "summary": updated_user.get('summary'),
+            "github": updated_user.get('github'),
+            "linkedin": updated_user.get('linkedin')
+        }
+    }
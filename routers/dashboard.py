@@ -1,20 +1,29 @@
-from fastapi import APIRouter, HTTPException, Depends
-from psycopg2.extras import RealDictCursor
-from services.database import get_connection
-from auth.dependencies import get_current_user
+from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
+from services.database import get_cursor
+from services.cache import cache_get, cache_set
+from auth.dependencies import get_current_user_id
 
 router = APIRouter(tags=["Dashboard"])
 
+# Global counts scan the whole jobs table; a little staleness is fine
+STATS_CACHE_KEY = "stats:v1"
+STATS_CACHE_TTL_SECONDS = 45
+
+# Handlers doing blocking psycopg2 work are plain `def` so FastAPI runs them
+# in its threadpool instead of on the event loop
+
 
 @router.get("/api/stats")
-async def get_stats():
+def get_stats():
     """
     Get database statistics
     """
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+    cached = cache_get(STATS_CACHE_KEY)
+    if cached is not None:
+        return cached
 
+    with get_cursor(autocommit=True) as cursor:
         cursor.execute("""
             SELECT
                 COUNT(*) as total_jobs,
@@ -25,81 +34,44 @@ async def get_stats():
         """)
         stats = cursor.fetchone()
 
-        cursor.close()
-        conn.close()
-
-        return stats
-
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    cache_set(STATS_CACHE_KEY, stats, STATS_CACHE_TTL_SECONDS)
+    return stats
 
 
 @router.get("/api/dashboard/stats")
-async def get_dashboard_stats(current_user: dict = Depends(get_current_user)):
+def get_dashboard_stats(user_id: int = Depends(get_current_user_id)):
     """
     Get dashboard statistics for current user (requires authentication)
     """
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        # Total applications by status for current user
+    with get_cursor(autocommit=True) as cursor:
+        # All dashboard aggregates in one round trip and one pass over the
+        # user's applications: counts are FILTERed per status group, then the
+        # groups are summed up and folded into by_status. SUMs are cast back
+        # to bigint so they come out as ints (numeric would be a Decimal)
         cursor.execute("""
+            WITH status_counts AS (
+                SELECT
+                    status,
+                    COUNT(*) AS count,
+                    COUNT(*) FILTER (
+                        WHERE deadline IS NOT NULL
+                        AND deadline BETWEEN NOW() AND NOW() + INTERVAL '7 days'
+                    ) AS upcoming_deadlines,
+                    COUNT(*) FILTER (
+                        WHERE applied_date >= NOW() - INTERVAL '7 days'
+                    ) AS applications_this_week
+                FROM applications
+                WHERE user_id = %(user_id)s
+                GROUP BY status
+            )
             SELECT
-                status,
-                COUNT(*) as count
-            FROM applications
-            WHERE user_id = %s
-            GROUP BY status
-        """, (current_user['id'],))
-        status_counts = cursor.fetchall()
-
-        # Upcoming deadlines (next 7 days) for current user
-        cursor.execute("""
-            SELECT COUNT(*) as count
-            FROM applications
-            WHERE user_id = %s
-            AND deadline IS NOT NULL
-            AND deadline BETWEEN NOW() AND NOW() + INTERVAL '7 days'
-        """, (current_user['id'],))
-        upcoming_deadlines = cursor.fetchone()
-
-        # Applications this week for current user
-        cursor.execute("""
-            SELECT COUNT(*) as count
-            FROM applications
-            WHERE user_id = %s
-            AND applied_date >= NOW() - INTERVAL '7 days'
-        """, (current_user['id'],))
-        this_week = cursor.fetchone()
-
-        # Get total count
-        cursor.execute("""
-            SELECT COUNT(*) as count FROM applications WHERE user_id = %s
-        """, (current_user['id'],))
-        total = cursor.fetchone()
-
-        # Get interview sessions count
-        cursor.execute("""
-            SELECT COUNT(*) as count FROM interview_sessions WHERE user_id = %s
-        """, (current_user['id'],))
-        interview_sessions = cursor.fetchone()
-
-        cursor.close()
-        conn.close()
-
-        # Convert status_counts array to object
-        by_status = {}
-        for item in status_counts:
-            by_status[item['status']] = item['count']
-
-        return {
-            "total": total['count'],
-            "by_status": by_status,
-            "upcoming_deadlines": upcoming_deadlines['count'],
-            "applications_this_week": this_week['count'],
-            "interview_sessions": interview_sessions['count']
-        }
+                COALESCE(SUM(count), 0)::bigint AS total,
+                COALESCE(json_object_agg(status, count) FILTER (WHERE status IS NOT NULL), '{}') AS by_status,
+                COALESCE(SUM(upcoming_deadlines), 0)::bigint AS upcoming_deadlines,
+                COALESCE(SUM(applications_this_week), 0)::bigint AS applications_this_week,
+                (SELECT COUNT(*) FROM interview_sessions WHERE user_id = %(user_id)s) AS interview_sessions
+            FROM status_counts
+        """, {"user_id": user_id})
+        stats = cursor.fetchone()
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return ORJSONResponse(stats)
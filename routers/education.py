@@ -1,26 +1,26 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import ORJSONResponse
 from typing import List
-from psycopg2.extras import RealDictCursor
-from services.database import get_connection
-from models.resume import EducationCreate, EducationUpdate
-from auth.dependencies import get_current_user
+from services.database import get_cursor, execute_prepared, build_update_sql, fetchall_dicts
+from services.cache import invalidate_resume_cache
+from models.resume import EducationCreate, EducationUpdate, Education
+from auth.dependencies import get_current_user_id
 
 router = APIRouter(prefix="/api/education", tags=["Education"])
 
+EDUCATION_COLUMNS = "id, user_id, school, degree, field_of_study, start_date, end_date, gpa, created_at"
+
 
 @router.post("", response_model=dict)
-async def create_education(education: EducationCreate, current_user: dict = Depends(get_current_user)):
+def create_education(education: EducationCreate, user_id: int = Depends(get_current_user_id)):
     """Create a new education entry"""
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        cursor.execute("""
+    with get_cursor(autocommit=True) as cursor:
+        execute_prepared(cursor, "insert_education", f"""
             INSERT INTO education (user_id, school, degree, field_of_study, start_date, end_date, gpa)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-            RETURNING id
+            VALUES ($1, $2, $3, $4, $5, $6, $7)
+            RETURNING {EDUCATION_COLUMNS}
         """, (
-            current_user['id'],
+            user_id,
             education.school,
             education.degree,
             education.field_of_study,
@@ -30,138 +30,68 @@ async def create_education(education: EducationCreate, current_user: dict = Depe
         ))
 
         result = cursor.fetchone()
-        conn.commit()
-        cursor.close()
-        conn.close()
 
-        return {"message": "Education created successfully", "id": result['id']}
+    invalidate_resume_cache(user_id)
+    return {"message": "Education created successfully", "id": result['id'], "record": result}
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
 
-
-@router.get("", response_model=List[dict])
-async def get_education_list(current_user: dict = Depends(get_current_user)):
+@router.get("", response_model=List[Education])
+def get_education_list(user_id: int = Depends(get_current_user_id)):
     """Get all education entries for current user"""
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        cursor.execute("""
-            SELECT * FROM education
-            WHERE user_id = %s
+    with get_cursor(dict_rows=False, autocommit=True) as cursor:
+        execute_prepared(cursor, "list_education", f"""
+            SELECT {EDUCATION_COLUMNS} FROM education
+            WHERE user_id = $1
             ORDER BY end_date DESC NULLS FIRST, start_date DESC
-        """, (current_user['id'],))
+        """, (user_id,))
 
-        education = cursor.fetchall()
-        cursor.close()
-        conn.close()
+        education = fetchall_dicts(cursor)
 
-        return education
-
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return ORJSONResponse(education)
 
 
 @router.get("/{education_id}", response_model=dict)
-async def get_education(education_id: int, current_user: dict = Depends(get_current_user)):
+def get_education(education_id: int, user_id: int = Depends(get_current_user_id)):
     """Get a specific education entry"""
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        cursor.execute("""
-            SELECT * FROM education WHERE id = %s AND user_id = %s
-        """, (education_id, current_user['id']))
+    with get_cursor(autocommit=True) as cursor:
+        execute_prepared(cursor, "get_education", f"""
+            SELECT {EDUCATION_COLUMNS} FROM education WHERE id = $1 AND user_id = $2
+        """, (education_id, user_id))
 
         education = cursor.fetchone()
-        cursor.close()
-        conn.close()
-
-        if not education:
-            raise HTTPException(status_code=404, detail="Education not found")
 
-        return education
+    if not education:
+        raise HTTPException(status_code=404, detail="Education not found")
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return education
 
 
 @router.patch("/{education_id}", response_model=dict)
-async def update_education(education_id: int, update: EducationUpdate, current_user: dict = Depends(get_current_user)):
+def update_education(education_id: int, update: EducationUpdate, user_id: int = Depends(get_current_user_id)):
     """Update an education entry"""
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        updates = []
-        params = []
-
-        if update.school is not None:
-            updates.append("school = %s")
-            params.append(update.school)
-        if update.degree is not None:
-            updates.append("degree = %s")
-            params.append(update.degree)
-        if update.field_of_study is not None:
-            updates.append("field_of_study = %s")
-            params.append(update.field_of_study)
-        if update.start_date is not None:
-            updates.append("start_date = %s")
-            params.append(update.start_date)
-        if update.end_date is not None:
-            updates.append("end_date = %s")
-            params.append(update.end_date)
-        if update.gpa is not None:
-            updates.append("gpa = %s")
-            params.append(update.gpa)
-
-        if not updates:
+    with get_cursor(dict_rows=False, autocommit=True) as cursor:
+        values = update.model_dump(exclude_none=True)
+        if not values:
             raise HTTPException(status_code=400, detail="No fields to update")
 
-        params.extend([education_id, current_user['id']])
-        query = f"UPDATE education SET {', '.join(updates)} WHERE id = %s AND user_id = %s RETURNING id"
+        statement_name, query = build_update_sql("education", tuple(values))
+        execute_prepared(cursor, statement_name, query, (*values.values(), education_id, user_id))
 
-        cursor.execute(query, params)
-        result = cursor.fetchone()
-
-        if not result:
+        if cursor.rowcount == 0:
             raise HTTPException(status_code=404, detail="Education not found")
 
-        conn.commit()
-        cursor.close()
-        conn.close()
-
-        return {"message": "Education updated successfully"}
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    invalidate_resume_cache(user_id)
+    return {"message": "Education updated successfully"}
 
 
 @router.delete("/{education_id}", response_model=dict)
-async def delete_education(education_id: int, current_user: dict = Depends(get_current_user)):
+def delete_education(education_id: int, user_id: int = Depends(get_current_user_id)):
     """Delete an education entry"""
-    try:
-        conn = get_connection()
-        cursor = conn.cursor()
+    with get_cursor(dict_rows=False, autocommit=True) as cursor:
+        execute_prepared(cursor, "delete_education", "DELETE FROM education WHERE id = $1 AND user_id = $2", (education_id, user_id))
 
-        cursor.execute("DELETE FROM education WHERE id = %s AND user_id = %s RETURNING id", (education_id, current_user['id']))
-        result = cursor.fetchone()
-
-        if not result:
+        if cursor.rowcount == 0:
             raise HTTPException(status_code=404, detail="Education not found")
 
-        conn.commit()
-        cursor.close()
-        conn.close()
-
-        return {"message": "Education deleted successfully"}
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    invalidate_resume_cache(user_id)
+    return {"message": "Education deleted successfully"}
@@ -1,40 +1,98 @@
-from fastapi import APIRouter, HTTPException, Depends, Request
-from fastapi.responses import StreamingResponse
-from typing import Optional, List
-from psycopg2.extras import RealDictCursor
-import psycopg2
+from fastapi import APIRouter, HTTPException, Depends, Request, Query, Body
+from fastapi.responses import StreamingResponse, ORJSONResponse
+from typing import Annotated, Optional, List
+from functools import lru_cache
+from psycopg2.extras import execute_values
 import uuid
-from services.database import get_connection
-from services.scraper import fetch_jobs, find_hiring_companies
+from services.database import get_cursor, iter_row_batches, json_array_chunks, fetchall_dicts
+from services.scraper import fetch_jobs, find_hiring_companies, ScraperBusyError, SCRAPE_SLOT_TIMEOUT_SECONDS
 from services.rate_limiter import limiter
 from services.resume_ai import get_user_resume_data, tailor_resume
-from services.resume_generator import generate_tailored_resume
+from services.resume_generator import generate_tailored_resume, iter_docx_chunks
 from models.job import Job, JobSave, JobSkip, JobSearchRequest, SkippedJob, EasyApplyRequest
-from auth.dependencies import get_current_user, get_optional_user
+from auth.dependencies import get_current_user_id, get_optional_user_id
 
 router = APIRouter(prefix="/api/jobs", tags=["Jobs"])
 
+# Handlers doing blocking psycopg2 work are plain `def` so FastAPI runs them
+# in its threadpool instead of on the event loop
+
+# Columns of the Job response model - avoids shipping user_id and any other
+# table columns that the response would strip anyway
+JOB_COLUMNS = "id, job_id, title, company, location, salary, job_type, description, url, source, posted_date, scraped_at"
+
+# Upper bound on POST /api/jobs/bulk, so one request can't hold a pooled
+# connection with an arbitrarily large INSERT; it fits one execute_values page
+BULK_SAVE_MAX_JOBS = 500
+
+GET_JOB_SQL = f"""
+    (SELECT {JOB_COLUMNS} FROM jobs WHERE id = %(id)s)
+    UNION ALL
+    (SELECT {JOB_COLUMNS} FROM jobs WHERE job_id = %(job_id)s)
+    LIMIT 1
+"""
+
+
+def _format_salary(salary_min, salary_max) -> Optional[str]:
+    """Salary range as display text, e.g. "$80,000 - $100,000"; None if unknown"""
+    if salary_min and salary_max:
+        return f"${salary_min:,} - ${salary_max:,}"
+    if salary_min or salary_max:
+        return f"${salary_min or salary_max:,}"
+    return None
+
+
+def _jobs_filter_sql(has_company: bool, has_location: bool) -> str:
+    """WHERE clause shared by the GET /api/jobs page and count queries"""
+    where = "WHERE user_id = %s"
+    if has_company:
+        where += " AND company ILIKE %s"
+    if has_location:
+        where += " AND location ILIKE %s"
+    return where
+
+
+@lru_cache(maxsize=None)
+def _get_jobs_sql(has_company: bool, has_location: bool, has_before_id: bool, has_limit: bool) -> str:
+    """SQL for GET /api/jobs for one combination of filters, built once per combination"""
+    query = f"SELECT {JOB_COLUMNS} FROM jobs {_jobs_filter_sql(has_company, has_location)}"
+    if has_before_id:
+        query += " AND id < %s"
+
+    # Most recently added (id DESC) first, so newly saved jobs appear first
+    query += " ORDER BY id DESC"
+    if has_limit:
+        query += " LIMIT %s"
+    return query
+
+
+@lru_cache(maxsize=None)
+def _count_jobs_sql(has_company: bool, has_location: bool) -> str:
+    """Number of jobs matching the GET /api/jobs filters, for X-Total-Count"""
+    return f"SELECT COUNT(*) FROM jobs {_jobs_filter_sql(has_company, has_location)}"
+
 
 @router.post("/search", response_model=dict)
 @limiter.limit("10/minute")  # 10 searches per minute per user/IP
-async def search_jobs(request: Request, search_request: JobSearchRequest, current_user: Optional[dict] = Depends(get_optional_user)):
+def search_jobs(request: Request, search_request: JobSearchRequest, user_id: Optional[int] = Depends(get_optional_user_id)):
     """
     Endpoint to search and fetch jobs from JSearch API
     Returns the jobs directly for display (does NOT auto-save)
     Query should include location, e.g. "Software Engineer in Canada"
     If authenticated, filters out jobs the user has already saved or skipped.
     """
+    # Parse location from query if user typed e.g. "Software engineer in ON,Canada"
+    query = search_request.query
+    location = search_request.location or ""
+    if not location and " in " in query.lower():
+        # Split on last occurrence of " in " to extract location
+        idx = query.lower().rfind(" in ")
+        location = query[idx + 4:].strip()
+        query = query[:idx].strip()
+
+    # Fetch jobs from scrapers; when every scrape slot stays taken, tell the
+    # client to retry instead of holding a worker thread indefinitely
     try:
-        # Parse location from query if user typed e.g. "Software engineer in ON,Canada"
-        query = search_request.query
-        location = search_request.location or ""
-        if not location and " in " in query.lower():
-            # Split on last occurrence of " in " to extract location
-            idx = query.lower().rfind(" in ")
-            location = query[idx + 4:].strip()
-            query = query[:idx].strip()
-
-        # Fetch jobs from scrapers
         raw_jobs = fetch_jobs(
             query=query,
             location=location,
@@ -43,117 +101,91 @@ async def search_jobs(request: Request, search_request: JobSearchRequest, curren
             sort_by=search_request.sort_by,
             refresh=search_request.refresh
         )
+    except ScraperBusyError:
+        raise HTTPException(
+            status_code=503,
+            detail="Job search is busy, please try again shortly",
+            headers={"Retry-After": str(SCRAPE_SLOT_TIMEOUT_SECONDS)}
+        )
 
-        if not raw_jobs:
-            return {"jobs": [], "message": "No jobs found"}
-
-        # Get user's saved and skipped jobs if authenticated
-        excluded_jobs = set()
-        if current_user:
-            conn = get_connection()
-            cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-            # Get saved jobs (title, company, location)
-            cursor.execute(
-                "SELECT title, company, location FROM jobs WHERE user_id = %s",
-                (current_user['id'],)
-            )
-            for row in cursor.fetchall():
-                key = (row['title'].lower(), row['company'].lower(), (row['location'] or '').lower())
-                excluded_jobs.add(key)
-
-            # Get skipped jobs (title, company, location)
-            cursor.execute(
-                "SELECT title, company, location FROM skipped_jobs WHERE user_id = %s",
-                (current_user['id'],)
-            )
-            for row in cursor.fetchall():
-                key = (row['title'].lower(), row['company'].lower(), (row['location'] or '').lower())
-                excluded_jobs.add(key)
-
-            cursor.close()
-            conn.close()
-
-        # Transform jobs to a simpler format for the frontend
-        jobs = []
-        filtered_count = 0
-        for job in raw_jobs:
-            # Format salary as string
-            salary_min = job.get('job_min_salary')
-            salary_max = job.get('job_max_salary')
-            if salary_min and salary_max:
-                salary = f"${salary_min:,} - ${salary_max:,}"
-            elif salary_min:
-                salary = f"${salary_min:,}"
-            elif salary_max:
-                salary = f"${salary_max:,}"
-            else:
-                salary = None
-
-            # Build location string with city, state, and country
-            city = job.get('job_city', '') or ''
-            state = job.get('job_state', '') or ''
-            country = job.get('job_country', '') or ''
-            location_parts = [p for p in [city, state, country] if p]
-            job_location = ', '.join(location_parts) if location_parts else ''
-
-            title = job.get('job_title', '') or ''
-            company = job.get('employer_name', '') or ''
-
-            # Skip if user has already saved or skipped this job
-            if current_user:
-                job_key = (title.lower(), company.lower(), job_location.lower())
-                if job_key in excluded_jobs:
-                    filtered_count += 1
-                    continue
-
-            jobs.append({
-                "title": title,
-                "company": company,
-                "location": job_location,
-                "salary": salary,
-                "description": (job.get('job_description', '') or '')[:500],
-                "url": job.get('job_apply_link', '') or job.get('job_google_link', '') or '',
-                "job_type": job.get('job_employment_type', '') or '',
-                "posted_date": job.get('job_posted_at_datetime_utc', '') or '',
-                "source": job.get('site', '') or 'scraped'
-            })
-
-        # Find companies hiring for this role
-        companies = []
-        try:
-            companies = find_hiring_companies(
-                query=search_request.query,
-                location=search_request.location or "",
-                max_companies=10,
-                refresh=search_request.refresh
-            )
-        except Exception as e:
-            print(f"Company search failed (non-critical): {e}")
-
-        # Jobs are NOT auto-saved - user must explicitly save
-        message = f"Found {len(jobs)} jobs"
-        if filtered_count > 0:
-            message += f" ({filtered_count} already saved/skipped)"
-        if companies:
-            message += f" and {len(companies)} hiring companies"
-        return {"jobs": jobs, "companies": companies, "message": message}
-
+    if not raw_jobs:
+        return {"jobs": [], "message": "No jobs found"}
+
+    # Get user's saved and skipped jobs if authenticated
+    excluded_jobs = set()
+    if user_id:
+        with get_cursor(dict_rows=False, autocommit=True) as cursor:
+            # Saved and skipped jobs in one round trip, normalized in SQL
+            # so the rows can be used as lookup keys as-is
+            cursor.execute("""
+                SELECT LOWER(title), LOWER(company), LOWER(COALESCE(location, ''))
+                FROM jobs WHERE user_id = %(user_id)s
+                UNION ALL
+                SELECT LOWER(title), LOWER(company), LOWER(COALESCE(location, ''))
+                FROM skipped_jobs WHERE user_id = %(user_id)s
+            """, {"user_id": user_id})
+            excluded_jobs = set(cursor.fetchall())
+
+    # Transform jobs to a simpler format for the frontend
+    jobs = []
+    filtered_count = 0
+    for job in raw_jobs:
+        # Build location string with city, state, and country
+        city = job.get('job_city', '') or ''
+        state = job.get('job_state', '') or ''
+        country = job.get('job_country', '') or ''
+        job_location = ', '.join(p for p in (city, state, country) if p)
+
+        title = job.get('job_title', '') or ''
+        company = job.get('employer_name', '') or ''
+
+        # Skip if user has already saved or skipped this job - before any
+        # of the formatting work below is spent on it
+        if excluded_jobs and (title.lower(), company.lower(), job_location.lower()) in excluded_jobs:
+            filtered_count += 1
+            continue
+
+        jobs.append({
+            "title": title,
+            "company": company,
+            "location": job_location,
+            "salary": _format_salary(job.get('job_min_salary'), job.get('job_max_salary')),
+            "description": (job.get('job_description', '') or '')[:500],
+            "url": job.get('job_apply_link', '') or job.get('job_google_link', '') or '',
+            "job_type": job.get('job_employment_type', '') or '',
+            "posted_date": job.get('job_posted_at_datetime_utc', '') or '',
+            "source": job.get('site', '') or 'scraped'
+        })
+
+    # Find companies hiring for this role
+    companies = []
+    try:
+        companies = find_hiring_companies(
+            query=search_request.query,
+            location=search_request.location or "",
+            max_companies=10,
+            refresh=search_request.refresh
+        )
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        print(f"Company search failed (non-critical): {e}")
+
+    # Jobs are NOT auto-saved - user must explicitly save
+    message = f"Found {len(jobs)} jobs"
+    if filtered_count > 0:
+        message += f" ({filtered_count} already saved/skipped)"
+    if companies:
+        message += f" and {len(companies)} hiring companies"
+    return {"jobs": jobs, "companies": companies, "message": message}
 
 
 @router.post("", response_model=dict)
-async def save_job(job: JobSave, current_user: dict = Depends(get_current_user)):
+def save_job(job: JobSave, user_id: int = Depends(get_current_user_id)):
     """
     Save a job to the database for the current user (requires authentication)
     """
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
+    with get_cursor() as cursor:
         # Generate a unique job_id
-        job_id = str(uuid.uuid4())[:20]
+        job_id = uuid.uuid4().hex[:20]
 
         cursor.execute("""
             INSERT INTO jobs (job_id, title, company, location, salary, job_type, description, url, posted_date, source, user_id)
@@ -170,162 +202,145 @@ async def save_job(job: JobSave, current_user: dict = Depends(get_current_user))
             job.url,
             job.posted_date if job.posted_date else None,
             job.source or 'scraped',
-            current_user['id']
+            user_id
         ))
 
         result = cursor.fetchone()
-        conn.commit()
-        cursor.close()
-        conn.close()
 
-        return {"message": "Job saved successfully", "id": result['id']}
+    return {"message": "Job saved successfully", "id": result['id']}
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/bulk", response_model=dict)
+def save_jobs_bulk(
+    jobs: Annotated[List[JobSave], Body(max_length=BULK_SAVE_MAX_JOBS)],
+    user_id: int = Depends(get_current_user_id)
+):
+    """
+    Save several jobs for the current user in one request (requires authentication).
+    At most BULK_SAVE_MAX_JOBS jobs per request; larger bodies are rejected with 422.
+    """
+    if not jobs:
+        raise HTTPException(status_code=400, detail="No jobs to save")
+
+    rows = [
+        (
+            uuid.uuid4().hex[:20],
+            job.title,
+            job.company,
+            job.location,
+            job.salary,
+            job.job_type,
+            job.description,
+            job.url,
+            job.posted_date if job.posted_date else None,
+            job.source or 'scraped',
+            user_id
+        )
+        for job in jobs
+    ]
+
+    with get_cursor(dict_rows=False) as cursor:
+        # A single multi-row INSERT instead of a statement per job
+        results = execute_values(cursor, """
+            INSERT INTO jobs (job_id, title, company, location, salary, job_type, description, url, posted_date, source, user_id)
+            VALUES %s
+            RETURNING id
+        """, rows, page_size=BULK_SAVE_MAX_JOBS, fetch=True)
+
+    return {"message": f"{len(results)} jobs saved successfully", "ids": [row[0] for row in results]}
 
 
 @router.delete("/{job_id}")
-async def delete_job(job_id: int, current_user: dict = Depends(get_current_user)):
+def delete_job(job_id: int, user_id: int = Depends(get_current_user_id)):
     """
     Delete a job from the database (requires authentication, must be owner)
     """
-    try:
-        conn = get_connection()
-        cursor = conn.cursor()
-
+    with get_cursor(dict_rows=False, autocommit=True) as cursor:
         # Only delete if the job belongs to the current user
-        cursor.execute("DELETE FROM jobs WHERE id = %s AND user_id = %s RETURNING id", (job_id, current_user['id']))
-        result = cursor.fetchone()
+        cursor.execute("DELETE FROM jobs WHERE id = %s AND user_id = %s", (job_id, user_id))
 
-        if not result:
-            cursor.close()
-            conn.close()
+        if cursor.rowcount == 0:
             raise HTTPException(status_code=404, detail="Job not found")
 
-        conn.commit()
-        cursor.close()
-        conn.close()
-
-        return {"message": "Job deleted successfully"}
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return {"message": "Job deleted successfully"}
 
 
 @router.post("/skip", response_model=dict)
-async def skip_job(job: JobSkip, current_user: dict = Depends(get_current_user)):
+def skip_job(job: JobSkip, user_id: int = Depends(get_current_user_id)):
     """
     Mark a job as skipped so it won't appear in future searches (requires authentication)
     """
-    try:
-        conn = get_connection()
-        cursor = conn.cursor()
-
+    with get_cursor(dict_rows=False) as cursor:
         cursor.execute("""
             INSERT INTO skipped_jobs (user_id, title, company, location)
             VALUES (%s, %s, %s, %s)
             ON CONFLICT (user_id, title, company, location) DO NOTHING
         """, (
-            current_user['id'],
+            user_id,
             job.title,
             job.company,
             job.location or ''
         ))
 
-        conn.commit()
-        cursor.close()
-        conn.close()
-
-        return {"message": "Job skipped successfully"}
-
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return {"message": "Job skipped successfully"}
 
 
 @router.get("/skipped", response_model=List[SkippedJob])
-async def get_skipped_jobs(current_user: dict = Depends(get_current_user)):
+def get_skipped_jobs(user_id: int = Depends(get_current_user_id)):
     """
     Get all skipped jobs for the current user (requires authentication)
     """
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
+    with get_cursor(dict_rows=False, autocommit=True) as cursor:
         cursor.execute(
             "SELECT id, title, company, location, skipped_at FROM skipped_jobs WHERE user_id = %s ORDER BY skipped_at DESC",
-            (current_user['id'],)
+            (user_id,)
         )
-        skipped_jobs = cursor.fetchall()
-
-        cursor.close()
-        conn.close()
-
-        return skipped_jobs
+        skipped_jobs = fetchall_dicts(cursor)
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    # Trusted rows with exactly the SkippedJob columns; skip revalidation
+    return ORJSONResponse(skipped_jobs)
 
 
 @router.delete("/skipped/{skipped_id}")
-async def delete_skipped_job(skipped_id: int, current_user: dict = Depends(get_current_user)):
+def delete_skipped_job(skipped_id: int, user_id: int = Depends(get_current_user_id)):
     """
     Remove a job from skipped list so it can appear in searches again (requires authentication)
     """
-    try:
-        conn = get_connection()
-        cursor = conn.cursor()
-
+    with get_cursor(dict_rows=False, autocommit=True) as cursor:
         cursor.execute(
-            "DELETE FROM skipped_jobs WHERE id = %s AND user_id = %s RETURNING id",
-            (skipped_id, current_user['id'])
+            "DELETE FROM skipped_jobs WHERE id = %s AND user_id = %s",
+            (skipped_id, user_id)
         )
-        result = cursor.fetchone()
 
-        if not result:
-            cursor.close()
-            conn.close()
+        if cursor.rowcount == 0:
             raise HTTPException(status_code=404, detail="Skipped job not found")
 
-        conn.commit()
-        cursor.close()
-        conn.close()
-
-        return {"message": "Job removed from skipped list"}
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return {"message": "Job removed from skipped list"}
 
 
 @router.post("/easy-apply")
-async def easy_apply(request: EasyApplyRequest, current_user: dict = Depends(get_current_user)):
+def easy_apply(request: EasyApplyRequest, user_id: int = Depends(get_current_user_id)):
     """
     Easy Apply: generates a tailored resume DOCX for the job and creates an application record.
     Returns the tailored resume as a downloadable DOCX file.
     """
-    try:
-        # 1. Get user's resume data
-        user_data = get_user_resume_data(current_user['id'])
+    # 1. Get user's resume data
+    user_data = get_user_resume_data(user_id)
 
-        # 2. Generate tailored resume content via AI
-        tailored_data = tailor_resume(user_data, request.job_description, request.job_title)
+    # 2. Generate tailored resume content via AI
+    tailored_data = tailor_resume(user_data, request.job_description, request.job_title)
 
-        # 3. Generate the tailored DOCX file
-        resume_file = generate_tailored_resume(tailored_data, request.job_title)
-
-        # 4. Create an application record
-        conn = get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+    # 3. Generate the tailored DOCX file
+    resume_file = generate_tailored_resume(tailored_data, request.job_title)
 
+    # 4. Create an application record
+    with get_cursor() as cursor:
         cursor.execute("""
             INSERT INTO applications (user_id, job_title, company, location, job_url, job_description, status, notes)
             VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
             RETURNING id
         """, (
-            current_user['id'],
+            user_id,
             request.job_title,
             request.company,
             request.location,
@@ -336,97 +351,99 @@ async def easy_apply(request: EasyApplyRequest, current_user: dict = Depends(get
         ))
 
         application = cursor.fetchone()
-        conn.commit()
-        cursor.close()
-        conn.close()
-
-        # 5. Return the tailored resume file with apply URL in headers
-        safe_job_title = request.job_title.replace(' ', '_').replace('/', '-')[:30]
-        filename = f"tailored_resume_{safe_job_title}.docx"
-
-        headers = {
-            "Content-Disposition": f"attachment; filename={filename}",
-            "X-Application-Id": str(application['id']),
-        }
-        if request.job_url:
-            headers["X-Apply-Url"] = request.job_url
-
-        return StreamingResponse(
-            resume_file,
-            media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            headers=headers
-        )
 
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    # 5. Return the tailored resume file with apply URL in headers
+    safe_job_title = request.job_title.replace(' ', '_').replace('/', '-')[:30]
+    filename = f"tailored_resume_{safe_job_title}.docx"
+
+    headers = {
+        "Content-Disposition": f"attachment; filename={filename}",
+        "X-Application-Id": str(application['id']),
+        "Content-Length": str(resume_file.getbuffer().nbytes),
+    }
+    if request.job_url:
+        headers["X-Apply-Url"] = request.job_url
+
+    return StreamingResponse(
+        iter_docx_chunks(resume_file),
+        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        headers=headers
+    )
 
 
 @router.get("", response_model=List[Job])
-async def get_jobs(
+def get_jobs(
     company: Optional[str] = None,
     location: Optional[str] = None,
-    current_user: dict = Depends(get_current_user)
+    limit: Optional[int] = Query(None, ge=1, le=200),
+    before_id: Optional[int] = None,
+    user_id: int = Depends(get_current_user_id)
 ):
     """
     Endpoint to get current user's saved jobs with optional filters (requires authentication)
+    Pass `limit` to page through the list; when more jobs remain, the X-Next-Cursor
+    header holds the `before_id` to request the next page with, and X-Total-Count
+    holds the number of jobs matching the filters.
     """
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        # Build query with filters - only get current user's jobs
-        query = "SELECT * FROM jobs WHERE user_id = %s"
-        params = [current_user['id']]
-
-        if company:
-            query += " AND company ILIKE %s"
-            params.append(f"%{company}%")
-
-        if location:
-            query += " AND location ILIKE %s"
-            params.append(f"{location}%")
-
-        # Order by most recently added (id DESC) so newly saved jobs appear first
-        query += " ORDER BY id DESC"
-
+    # Only get current user's jobs; params follow the SQL's placeholder order
+    filter_params = [user_id]
+    if company:
+        filter_params.append(f"%{company}%")
+    if location:
+        filter_params.append(f"{location}%")
+    params = list(filter_params)
+    if before_id is not None:
+        params.append(before_id)
+    if limit is not None:
+        params.append(limit)
+
+    query = _get_jobs_sql(bool(company), bool(location), before_id is not None, limit is not None)
+
+    if limit is None:
+        # Unpaged: stream the whole list from a server-side cursor in
+        # batches instead of materializing it. The first batch is fetched
+        # here so a failing query still turns into a 500
+        batches = iter_row_batches(query, params)
+        first_batch = next(batches, [])
+        return StreamingResponse(json_array_chunks(first_batch, batches), media_type="application/json")
+
+    with get_cursor(dict_rows=False, autocommit=True) as cursor:
         cursor.execute(query, params)
-        jobs = cursor.fetchall()
+        jobs = fetchall_dicts(cursor)
 
-        cursor.close()
-        conn.close()
+        # The total comes from a separate plain COUNT rather than a window
+        # over the page query, so each keyset page still reads only its own
+        # rows and every page (even an empty one) reports the total
+        cursor.execute(_count_jobs_sql(bool(company), bool(location)), filter_params)
+        total_count = cursor.fetchone()[0]
 
-        return jobs
+    headers = {"X-Total-Count": str(total_count)}
+    if len(jobs) == limit:
+        headers["X-Next-Cursor"] = str(jobs[-1]['id'])
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    # Rows come straight from our own table; encode them with orjson
+    # rather than re-validating each one against the Job model
+    return ORJSONResponse(jobs, headers=headers)
 
 
 @router.get("/{job_id}")
-async def get_job(job_id: str):
+def get_job(job_id: str):
     """
     Get a specific job by id (numeric) or job_id (string)
     """
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        # Try to match by numeric id first, then by job_id string
-        if job_id.isdigit():
-            cursor.execute("SELECT * FROM jobs WHERE id = %s OR job_id = %s", (int(job_id), job_id))
-        else:
-            cursor.execute("SELECT * FROM jobs WHERE job_id = %s", (job_id,))
+    with get_cursor(autocommit=True) as cursor:
+        # Match by numeric id first, then by job_id string. Each branch of
+        # the UNION ALL is a plain equality the planner can serve from its
+        # own index (an OR across the two columns can't); a non-numeric
+        # job_id passes NULL, which matches no id
+        cursor.execute(GET_JOB_SQL, {
+            "id": int(job_id) if job_id.isdigit() else None,
+            "job_id": job_id
+        })
 
         job = cursor.fetchone()
 
-        cursor.close()
-        conn.close()
-
-        if not job:
-            raise HTTPException(status_code=404, detail="Job not found")
-
-        return job
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
 
-    except psycopg2.Error as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return job
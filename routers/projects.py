@@ -1,26 +1,26 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import ORJSONResponse
 from typing import List
-from psycopg2.extras import RealDictCursor
-from services.database import get_connection
-from models.resume import ProjectCreate, ProjectUpdate
-from auth.dependencies import get_current_user
+from services.database import get_cursor, execute_prepared, build_update_sql, fetchall_dicts
+from services.cache import invalidate_resume_cache
+from models.resume import ProjectCreate, ProjectUpdate, Project
+from auth.dependencies import get_current_user_id
 
 router = APIRouter(prefix="/api/projects", tags=["Projects"])
 
+PROJECT_COLUMNS = "id, user_id, title, description, technologies, url, start_date, end_date, created_at"
+
 
 @router.post("", response_model=dict)
-async def create_project(project: ProjectCreate, current_user: dict = Depends(get_current_user)):
+def create_project(project: ProjectCreate, user_id: int = Depends(get_current_user_id)):
     """Create a new project"""
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        cursor.execute("""
+    with get_cursor(autocommit=True) as cursor:
+        execute_prepared(cursor, "insert_project", f"""
             INSERT INTO projects (user_id, title, description, technologies, url, start_date, end_date)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-            RETURNING id
+            VALUES ($1, $2, $3, $4, $5, $6, $7)
+            RETURNING {PROJECT_COLUMNS}
         """, (
-            current_user['id'],
+            user_id,
             project.title,
             project.description,
             project.technologies,
@@ -30,138 +30,68 @@ async def create_project(project: ProjectCreate, current_user: dict = Depends(ge
         ))
 
         result = cursor.fetchone()
-        conn.commit()
-        cursor.close()
-        conn.close()
 
-        return {"message": "Project created successfully", "id": result['id']}
+    invalidate_resume_cache(user_id)
+    return {"message": "Project created successfully", "id": result['id'], "record": result}
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
 
-
-@router.get("", response_model=List[dict])
-async def get_projects(current_user: dict = Depends(get_current_user)):
+@router.get("", response_model=List[Project])
+def get_projects(user_id: int = Depends(get_current_user_id)):
     """Get all projects for current user"""
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        cursor.execute("""
-            SELECT * FROM projects
-            WHERE user_id = %s
+    with get_cursor(dict_rows=False, autocommit=True) as cursor:
+        execute_prepared(cursor, "list_projects", f"""
+            SELECT {PROJECT_COLUMNS} FROM projects
+            WHERE user_id = $1
             ORDER BY end_date DESC NULLS FIRST, start_date DESC
-        """, (current_user['id'],))
+        """, (user_id,))
 
-        projects = cursor.fetchall()
-        cursor.close()
-        conn.close()
+        projects = fetchall_dicts(cursor)
 
-        return projects
-
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return ORJSONResponse(projects)
 
 
 @router.get("/{project_id}", response_model=dict)
-async def get_project(project_id: int, current_user: dict = Depends(get_current_user)):
+def get_project(project_id: int, user_id: int = Depends(get_current_user_id)):
     """Get a specific project"""
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        cursor.execute("""
-            SELECT * FROM projects WHERE id = %s AND user_id = %s
-        """, (project_id, current_user['id']))
+    with get_cursor(autocommit=True) as cursor:
+        execute_prepared(cursor, "get_project", f"""
+            SELECT {PROJECT_COLUMNS} FROM projects WHERE id = $1 AND user_id = $2
+        """, (project_id, user_id))
 
         project = cursor.fetchone()
-        cursor.close()
-        conn.close()
-
-        if not project:
-            raise HTTPException(status_code=404, detail="Project not found")
 
-        return project
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return project
 
 
 @router.patch("/{project_id}", response_model=dict)
-async def update_project(project_id: int, update: ProjectUpdate, current_user: dict = Depends(get_current_user)):
+def update_project(project_id: int, update: ProjectUpdate, user_id: int = Depends(get_current_user_id)):
     """Update a project"""
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        updates = []
-        params = []
-
-        if update.title is not None:
-            updates.append("title = %s")
-            params.append(update.title)
-        if update.description is not None:
-            updates.append("description = %s")
-            params.append(update.description)
-        if update.technologies is not None:
-            updates.append("technologies = %s")
-            params.append(update.technologies)
-        if update.url is not None:
-            updates.append("url = %s")
-            params.append(update.url)
-        if update.start_date is not None:
-            updates.append("start_date = %s")
-            params.append(update.start_date)
-        if update.end_date is not None:
-            updates.append("end_date = %s")
-            params.append(update.end_date)
-
-        if not updates:
+    with get_cursor(dict_rows=False, autocommit=True) as cursor:
+        values = update.model_dump(exclude_none=True)
+        if not values:
             raise HTTPException(status_code=400, detail="No fields to update")
 
-        params.extend([project_id, current_user['id']])
-        query = f"UPDATE projects SET {', '.join(updates)} WHERE id = %s AND user_id = %s RETURNING id"
+        statement_name, query = build_update_sql("projects", tuple(values))
+        execute_prepared(cursor, statement_name, query, (*values.values(), project_id, user_id))
 
-        cursor.execute(query, params)
-        result = cursor.fetchone()
-
-        if not result:
+        if cursor.rowcount == 0:
             raise HTTPException(status_code=404, detail="Project not found")
 
-        conn.commit()
-        cursor.close()
-        conn.close()
-
-        return {"message": "Project updated successfully"}
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    invalidate_resume_cache(user_id)
+    return {"message": "Project updated successfully"}
 
 
 @router.delete("/{project_id}", response_model=dict)
-async def delete_project(project_id: int, current_user: dict = Depends(get_current_user)):
+def delete_project(project_id: int, user_id: int = Depends(get_current_user_id)):
     """Delete a project"""
-    try:
-        conn = get_connection()
-        cursor = conn.cursor()
+    with get_cursor(dict_rows=False, autocommit=True) as cursor:
+        execute_prepared(cursor, "delete_project", "DELETE FROM projects WHERE id = $1 AND user_id = $2", (project_id, user_id))
 
-        cursor.execute("DELETE FROM projects WHERE id = %s AND user_id = %s RETURNING id", (project_id, current_user['id']))
-        result = cursor.fetchone()
-
-        if not result:
+        if cursor.rowcount == 0:
             raise HTTPException(status_code=404, detail="Project not found")
 
-        conn.commit()
-        cursor.close()
-        conn.close()
-
-        return {"message": "Project deleted successfully"}
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    invalidate_resume_cache(user_id)
+    return {"message": "Project deleted successfully"}
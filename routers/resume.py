@@ -1,77 +1,78 @@
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Request, Response
 from fastapi.responses import StreamingResponse
-from psycopg2.extras import RealDictCursor
+from fastapi.concurrency import run_in_threadpool
 from psycopg2 import Binary
+import hashlib
 import io
-from services.database import get_connection
-from services.resume_generator import generate_resume, generate_tailored_resume
+from services.database import get_cursor
+from services.cache import get_resume_version
+from services.resume_generator import generate_resume, generate_tailored_resume, iter_docx_chunks
 from services.resume_ai import get_user_resume_data, analyze_resume_match, tailor_resume
 from services.resume_parser import extract_text_from_pdf, parse_resume_with_ai, save_parsed_resume_data
 from models.resume import ResumeAnalysisRequest, ResumeAnalysisResponse, TailoredResumeRequest, ResumeUploadResponse
-from auth.dependencies import get_current_user
+from auth.dependencies import get_current_user, get_current_user_id
 
 router = APIRouter(tags=["Resume"])
 
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
 
+# Handlers doing blocking work (psycopg2, OpenAI, python-docx) are plain `def`
+# so FastAPI runs them in its threadpool instead of on the event loop
+
 
 @router.get("/api/resume", response_model=dict)
-async def get_complete_resume(current_user: dict = Depends(get_current_user)):
+def get_complete_resume(request: Request, user_id: int = Depends(get_current_user_id)):
     """Get complete resume data for current user"""
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        # Get work experiences
-        cursor.execute("""
-            SELECT * FROM work_experiences WHERE user_id = %s
-            ORDER BY is_current DESC, end_date DESC NULLS FIRST
-        """, (current_user['id'],))
-        work_experiences = cursor.fetchall()
-
-        # Get education
+    # The ETag follows the user's resume version, which every section or
+    # profile change bumps, so a client revalidating an unchanged resume gets
+    # a 304 without anything being queried. No version (Redis unreachable)
+    # means no ETag and no 304 - the version can't vouch for the data then
+    headers = {}
+    version = get_resume_version(user_id)
+    if version is not None:
+        etag = '"' + hashlib.md5(f"{user_id}:{version}".encode()).hexdigest() + '"'
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+
+    with get_cursor(dict_rows=False, autocommit=True) as cursor:
+        # The profile row and all four sections in one round trip, each built
+        # into JSON by Postgres and fetched as text, so they are spliced into
+        # the response as-is instead of being decoded and re-encoded. The
+        # profile is read here rather than from the cached auth user so the
+        # whole payload matches the version its ETag was issued for
         cursor.execute("""
-            SELECT * FROM education WHERE user_id = %s
-            ORDER BY end_date DESC NULLS FIRST
-        """, (current_user['id'],))
-        education = cursor.fetchall()
-
-        # Get skills
-        cursor.execute("""
-            SELECT * FROM skills WHERE user_id = %s ORDER BY skill_name
-        """, (current_user['id'],))
-        skills = cursor.fetchall()
-
-        # Get projects
-        cursor.execute("""
-            SELECT * FROM projects WHERE user_id = %s
-            ORDER BY end_date DESC NULLS FIRST
-        """, (current_user['id'],))
-        projects = cursor.fetchall()
-
-        cursor.close()
-        conn.close()
-
-        return {
-            "user": {
-                "id": current_user['id'],
-                "name": current_user['name'],
-                "email": current_user['email'],
-                "phone": current_user['phone'],
-                "location": current_user['location']
-            },
-            "work_experiences": work_experiences,
-            "education": education,
-            "skills": skills,
-            "projects": projects
-        }
-
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+            SELECT
+                json_build_object(
+                    'id', u.id, 'name', u.name, 'email', u.email,
+                    'phone', u.phone, 'location', u.location
+                )::text,
+                (SELECT COALESCE(json_agg(w ORDER BY w.is_current DESC, w.end_date DESC NULLS FIRST), '[]')
+                 FROM work_experiences w WHERE w.user_id = u.id)::text,
+                (SELECT COALESCE(json_agg(e ORDER BY e.end_date DESC NULLS FIRST), '[]')
+                 FROM education e WHERE e.user_id = u.id)::text,
+                (SELECT COALESCE(json_agg(s ORDER BY s.skill_name), '[]')
+                 FROM skills s WHERE s.user_id = u.id)::text,
+                (SELECT COALESCE(json_agg(p ORDER BY p.end_date DESC NULLS FIRST), '[]')
+                 FROM projects p WHERE p.user_id = u.id)::text
+            FROM users u
+            WHERE u.id = %s
+        """, (user_id,))
+        row = cursor.fetchone()
+
+    if row is None:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    user, work_experiences, education, skills, projects = row
+    content = (
+        f'{{"user":{user},"work_experiences":{work_experiences},"education":{education},'
+        f'"skills":{skills},"projects":{projects}}}'
+    )
+    return Response(content=content, media_type="application/json", headers=headers)
 
 
 @router.get("/api/users/{user_id}/resume/download")
-async def download_resume(user_id: int, current_user: dict = Depends(get_current_user)):
+def download_resume(user_id: int, current_user: dict = Depends(get_current_user)):
     """
     Generate and download resume as DOCX
     """
@@ -79,91 +80,94 @@ async def download_resume(user_id: int, current_user: dict = Depends(get_current
     if current_user['id'] != user_id:
         raise HTTPException(status_code=403, detail="Not authorized to access this resume")
 
-    try:
-        # Generate resume
-        resume_file = generate_resume(user_id)
-
-        # Return as downloadable file
-        return StreamingResponse(
-            resume_file,
-            media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            headers={
-                "Content-Disposition": f"attachment; filename=resume_{current_user['name'].replace(' ', '_')}.docx"
-            }
-        )
+    # Generate resume
+    resume_file = generate_resume(user_id)
 
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    # Return as downloadable file
+    return StreamingResponse(
+        iter_docx_chunks(resume_file),
+        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        headers={
+            "Content-Disposition": f"attachment; filename=resume_{current_user['name'].replace(' ', '_')}.docx",
+            "Content-Length": str(resume_file.getbuffer().nbytes)
+        }
+    )
 
 
 @router.post("/api/users/{user_id}/resume/analyze", response_model=ResumeAnalysisResponse)
-async def analyze_user_resume(
+def analyze_user_resume(
     user_id: int,
     request: ResumeAnalysisRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user_id: int = Depends(get_current_user_id)
 ):
     """
     Analyze how well user's resume matches a specific job description
     """
-    if current_user['id'] != user_id:
+    if current_user_id != user_id:
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    try:
-        # Get user resume data
-        user_data = get_user_resume_data(user_id)
-
-        # Analyze match using the provided job description
-        analysis = analyze_resume_match(user_data, request.job_description)
+    # Get user resume data (this also loads the user row, so the auth
+    # dependency only needs the token's id)
+    user_data = get_user_resume_data(user_id)
 
-        return analysis
+    # Analyze match using the provided job description
+    analysis = analyze_resume_match(user_data, request.job_description)
 
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return analysis
 
 
 @router.post("/api/users/{user_id}/resume/tailor")
-async def create_tailored_resume(
+def create_tailored_resume(
     user_id: int,
     request: TailoredResumeRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user_id: int = Depends(get_current_user_id)
 ):
     """
     Generate a tailored resume DOCX file for a specific job
     Returns the tailored resume as a downloadable file
     """
-    if current_user['id'] != user_id:
+    if current_user_id != user_id:
         raise HTTPException(status_code=403, detail="Not authorized")
 
-    try:
-        # Get user resume data
-        user_data = get_user_resume_data(user_id)
+    # Get user resume data
+    user_data = get_user_resume_data(user_id)
 
-        # Generate tailored content using AI
-        tailored_data = tailor_resume(user_data, request.job_description, request.job_title)
+    # Generate tailored content using AI
+    tailored_data = tailor_resume(user_data, request.job_description, request.job_title)
 
-        # Generate the tailored resume DOCX
-        resume_file = generate_tailored_resume(tailored_data, request.job_title)
+    # Generate the tailored resume DOCX
+    resume_file = generate_tailored_resume(tailored_data, request.job_title)
 
-        # Create safe filename
-        safe_job_title = request.job_title.replace(' ', '_').replace('/', '-')[:30]
-        filename = f"tailored_resume_{safe_job_title}.docx"
+    # Create safe filename
+    safe_job_title = request.job_title.replace(' ', '_').replace('/', '-')[:30]
+    filename = f"tailored_resume_{safe_job_title}.docx"
 
-        return StreamingResponse(
-            resume_file,
-            media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}"
-            }
-        )
+    return StreamingResponse(
+        iter_docx_chunks(resume_file),
+        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}",
+            "Content-Length": str(resume_file.getbuffer().nbytes)
+        }
+    )
 
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+
+def _store_resume_file(user_id: int, filename: str, file_bytes: bytes):
+    """Replace the user's stored resume PDF (blocking - run it in the threadpool)"""
+    with get_cursor(dict_rows=False) as cursor:
+        cursor.execute(
+            "DELETE FROM user_resumes WHERE user_id = %s",
+            (user_id,)
+        )
+        cursor.execute("""
+            INSERT INTO user_resumes (user_id, filename, file_data, file_size)
+            VALUES (%s, %s, %s, %s)
+        """, (
+            user_id,
+            filename,
+            Binary(file_bytes),
+            len(file_bytes)
+        ))
 
 
 @router.post("/api/resume/upload", response_model=ResumeUploadResponse)
@@ -189,106 +193,63 @@ async def upload_resume(
     if len(file_bytes) == 0:
         raise HTTPException(status_code=400, detail="File is empty")
 
-    try:
-        # Store PDF in database (upsert - replace if exists)
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute(
-            "DELETE FROM user_resumes WHERE user_id = %s",
-            (current_user['id'],)
-        )
-        cursor.execute("""
-            INSERT INTO user_resumes (user_id, filename, file_data, file_size)
-            VALUES (%s, %s, %s, %s)
-        """, (
-            current_user['id'],
-            file.filename,
-            Binary(file_bytes),
-            len(file_bytes)
-        ))
-        conn.commit()
-        cursor.close()
-        conn.close()
-
-        # Extract text from PDF
-        resume_text = extract_text_from_pdf(file_bytes)
+    # Store PDF in database (upsert - replace if exists)
+    await run_in_threadpool(_store_resume_file, current_user['id'], file.filename, file_bytes)
 
-        # Parse with AI
-        parsed_data = parse_resume_with_ai(resume_text)
+    # Extract text from PDF; an unreadable (e.g. image-only) PDF is the
+    # client's problem, not a server error
+    try:
+        resume_text = await run_in_threadpool(extract_text_from_pdf, file_bytes)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-        # Save parsed data to profile tables
-        counts = save_parsed_resume_data(current_user['id'], parsed_data)
+    # Parse with AI
+    parsed_data = await run_in_threadpool(parse_resume_with_ai, resume_text)
 
-        return ResumeUploadResponse(
-            message="Resume uploaded and parsed successfully",
-            filename=file.filename,
-            file_size=len(file_bytes),
-            parsed_data=parsed_data,
-            counts=counts
-        )
+    # Save parsed data to profile tables
+    counts = await run_in_threadpool(save_parsed_resume_data, current_user['id'], parsed_data)
 
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return ResumeUploadResponse(
+        message="Resume uploaded and parsed successfully",
+        filename=file.filename,
+        file_size=len(file_bytes),
+        parsed_data=parsed_data,
+        counts=counts
+    )
 
 
 @router.get("/api/resume/file")
-async def get_resume_file(current_user: dict = Depends(get_current_user)):
+def get_resume_file(current_user: dict = Depends(get_current_user)):
     """Download the user's uploaded resume PDF"""
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
+    with get_cursor(autocommit=True) as cursor:
         cursor.execute(
             "SELECT filename, file_data FROM user_resumes WHERE user_id = %s",
             (current_user['id'],)
         )
         resume = cursor.fetchone()
-        cursor.close()
-        conn.close()
 
-        if not resume:
-            raise HTTPException(status_code=404, detail="No resume file found")
+    if not resume:
+        raise HTTPException(status_code=404, detail="No resume file found")
 
-        return StreamingResponse(
-            io.BytesIO(bytes(resume['file_data'])),
-            media_type="application/pdf",
-            headers={
-                "Content-Disposition": f"attachment; filename={resume['filename']}"
-            }
-        )
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return StreamingResponse(
+        io.BytesIO(bytes(resume['file_data'])),
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": f"attachment; filename={resume['filename']}"
+        }
+    )
 
 
 @router.delete("/api/resume/file")
-async def delete_resume_file(current_user: dict = Depends(get_current_user)):
+def delete_resume_file(current_user: dict = Depends(get_current_user)):
     """Delete the user's uploaded resume PDF"""
-    try:
-        conn = get_connection()
-        cursor = conn.cursor()
-
+    with get_cursor(dict_rows=False, autocommit=True) as cursor:
         cursor.execute(
-            "DELETE FROM user_resumes WHERE user_id = %s RETURNING id",
+            "DELETE FROM user_resumes WHERE user_id = %s",
             (current_user['id'],)
         )
-        result = cursor.fetchone()
 
-        if not result:
+        if cursor.rowcount == 0:
             raise HTTPException(status_code=404, detail="No resume file found")
 
-        conn.commit()
-        cursor.close()
-        conn.close()
-
-        return {"message": "Resume file deleted successfully"}
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return {"message": "Resume file deleted successfully"}
@@ -1,151 +1,93 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import ORJSONResponse
 from typing import List
-from psycopg2.extras import RealDictCursor
-from services.database import get_connection
-from models.resume import SkillCreate, SkillUpdate
-from auth.dependencies import get_current_user
+from services.database import get_cursor, execute_prepared, build_update_sql, fetchall_dicts
+from services.cache import invalidate_resume_cache
+from models.resume import SkillCreate, SkillUpdate, Skill
+from auth.dependencies import get_current_user_id
 
 router = APIRouter(prefix="/api/skills", tags=["Skills"])
 
+SKILL_COLUMNS = "id, user_id, skill_name, proficiency, created_at"
+
 
 @router.post("", response_model=dict)
-async def create_skill(skill: SkillCreate, current_user: dict = Depends(get_current_user)):
+def create_skill(skill: SkillCreate, user_id: int = Depends(get_current_user_id)):
     """Create a new skill"""
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        cursor.execute("""
+    with get_cursor(autocommit=True) as cursor:
+        execute_prepared(cursor, "insert_skill", f"""
             INSERT INTO skills (user_id, skill_name, proficiency)
-            VALUES (%s, %s, %s)
-            RETURNING id
+            VALUES ($1, $2, $3)
+            RETURNING {SKILL_COLUMNS}
         """, (
-            current_user['id'],
+            user_id,
             skill.skill_name,
             skill.proficiency
         ))
 
         result = cursor.fetchone()
-        conn.commit()
-        cursor.close()
-        conn.close()
-
-        return {"message": "Skill created successfully", "id": result['id']}
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    invalidate_resume_cache(user_id)
+    return {"message": "Skill created successfully", "id": result['id'], "record": result}
 
 
-@router.get("", response_model=List[dict])
-async def get_skills(current_user: dict = Depends(get_current_user)):
+@router.get("", response_model=List[Skill])
+def get_skills(user_id: int = Depends(get_current_user_id)):
     """Get all skills for current user"""
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        cursor.execute("""
-            SELECT * FROM skills
-            WHERE user_id = %s
+    with get_cursor(dict_rows=False, autocommit=True) as cursor:
+        execute_prepared(cursor, "list_skills", f"""
+            SELECT {SKILL_COLUMNS} FROM skills
+            WHERE user_id = $1
             ORDER BY skill_name ASC
-        """, (current_user['id'],))
-
-        skills = cursor.fetchall()
-        cursor.close()
-        conn.close()
+        """, (user_id,))
 
-        return skills
+        skills = fetchall_dicts(cursor)
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return ORJSONResponse(skills)
 
 
 @router.get("/{skill_id}", response_model=dict)
-async def get_skill(skill_id: int, current_user: dict = Depends(get_current_user)):
+def get_skill(skill_id: int, user_id: int = Depends(get_current_user_id)):
     """Get a specific skill"""
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        cursor.execute("""
-            SELECT * FROM skills WHERE id = %s AND user_id = %s
-        """, (skill_id, current_user['id']))
+    with get_cursor(autocommit=True) as cursor:
+        execute_prepared(cursor, "get_skill", f"""
+            SELECT {SKILL_COLUMNS} FROM skills WHERE id = $1 AND user_id = $2
+        """, (skill_id, user_id))
 
         skill = cursor.fetchone()
-        cursor.close()
-        conn.close()
-
-        if not skill:
-            raise HTTPException(status_code=404, detail="Skill not found")
 
-        return skill
+    if not skill:
+        raise HTTPException(status_code=404, detail="Skill not found")
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return skill
 
 
 @router.patch("/{skill_id}", response_model=dict)
-async def update_skill(skill_id: int, update: SkillUpdate, current_user: dict = Depends(get_current_user)):
+def update_skill(skill_id: int, update: SkillUpdate, user_id: int = Depends(get_current_user_id)):
     """Update a skill"""
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        updates = []
-        params = []
-
-        if update.skill_name is not None:
-            updates.append("skill_name = %s")
-            params.append(update.skill_name)
-        if update.proficiency is not None:
-            updates.append("proficiency = %s")
-            params.append(update.proficiency)
-
-        if not updates:
+    with get_cursor(dict_rows=False, autocommit=True) as cursor:
+        values = update.model_dump(exclude_none=True)
+        if not values:
             raise HTTPException(status_code=400, detail="No fields to update")
 
-        params.extend([skill_id, current_user['id']])
-        query = f"UPDATE skills SET {', '.join(updates)} WHERE id = %s AND user_id = %s RETURNING id"
-
-        cursor.execute(query, params)
-        result = cursor.fetchone()
+        statement_name, query = build_update_sql("skills", tuple(values))
+        execute_prepared(cursor, statement_name, query, (*values.values(), skill_id, user_id))
 
-        if not result:
+        if cursor.rowcount == 0:
             raise HTTPException(status_code=404, detail="Skill not found")
 
-        conn.commit()
-        cursor.close()
-        conn.close()
-
-        return {"message": "Skill updated successfully"}
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    invalidate_resume_cache(user_id)
+    return {"message": "Skill updated successfully"}
 
 
 @router.delete("/{skill_id}", response_model=dict)
-async def delete_skill(skill_id: int, current_user: dict = Depends(get_current_user)):
+def delete_skill(skill_id: int, user_id: int = Depends(get_current_user_id)):
     """Delete a skill"""
-    try:
-        conn = get_connection()
-        cursor = conn.cursor()
+    with get_cursor(dict_rows=False, autocommit=True) as cursor:
+        execute_prepared(cursor, "delete_skill", "DELETE FROM skills WHERE id = $1 AND user_id = $2", (skill_id, user_id))
 
-        cursor.execute("DELETE FROM skills WHERE id = %s AND user_id = %s RETURNING id", (skill_id, current_user['id']))
-        result = cursor.fetchone()
-
-        if not result:
+        if cursor.rowcount == 0:
             raise HTTPException(status_code=404, detail="Skill not found")
 
-        conn.commit()
-        cursor.close()
-        conn.close()
-
-        return {"message": "Skill deleted successfully"}
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    invalidate_resume_cache(user_id)
+    return {"message": "Skill deleted successfully"}
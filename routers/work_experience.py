@@ -1,26 +1,26 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import ORJSONResponse
 from typing import List
-from psycopg2.extras import RealDictCursor
-from services.database import get_connection
-from models.resume import WorkExperienceCreate, WorkExperienceUpdate
-from auth.dependencies import get_current_user
+from services.database import get_cursor, execute_prepared, build_update_sql, fetchall_dicts
+from services.cache import invalidate_resume_cache
+from models.resume import WorkExperienceCreate, WorkExperienceUpdate, WorkExperience
+from auth.dependencies import get_current_user_id
 
 router = APIRouter(prefix="/api/work-experience", tags=["Work Experience"])
 
+WORK_EXPERIENCE_COLUMNS = "id, user_id, company, title, start_date, end_date, is_current, responsibilities, created_at"
+
 
 @router.post("", response_model=dict)
-async def create_work_experience(experience: WorkExperienceCreate, current_user: dict = Depends(get_current_user)):
+def create_work_experience(experience: WorkExperienceCreate, user_id: int = Depends(get_current_user_id)):
     """Create a new work experience entry"""
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        cursor.execute("""
+    with get_cursor(autocommit=True) as cursor:
+        execute_prepared(cursor, "insert_work_experience", f"""
             INSERT INTO work_experiences (user_id, company, title, start_date, end_date, is_current, responsibilities)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-            RETURNING id
+            VALUES ($1, $2, $3, $4, $5, $6, $7)
+            RETURNING {WORK_EXPERIENCE_COLUMNS}
         """, (
-            current_user['id'],
+            user_id,
             experience.company,
             experience.title,
             experience.start_date,
@@ -30,138 +30,68 @@ async def create_work_experience(experience: WorkExperienceCreate, current_user:
         ))
 
         result = cursor.fetchone()
-        conn.commit()
-        cursor.close()
-        conn.close()
 
-        return {"message": "Work experience created successfully", "id": result['id']}
+    invalidate_resume_cache(user_id)
+    return {"message": "Work experience created successfully", "id": result['id'], "record": result}
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
 
-
-@router.get("", response_model=List[dict])
-async def get_work_experiences(current_user: dict = Depends(get_current_user)):
+@router.get("", response_model=List[WorkExperience])
+def get_work_experiences(user_id: int = Depends(get_current_user_id)):
     """Get all work experiences for current user"""
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        cursor.execute("""
-            SELECT * FROM work_experiences
-            WHERE user_id = %s
+    with get_cursor(dict_rows=False, autocommit=True) as cursor:
+        execute_prepared(cursor, "list_work_experiences", f"""
+            SELECT {WORK_EXPERIENCE_COLUMNS} FROM work_experiences
+            WHERE user_id = $1
             ORDER BY is_current DESC, end_date DESC NULLS FIRST, start_date DESC
-        """, (current_user['id'],))
+        """, (user_id,))
 
-        experiences = cursor.fetchall()
-        cursor.close()
-        conn.close()
+        experiences = fetchall_dicts(cursor)
 
-        return experiences
-
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return ORJSONResponse(experiences)
 
 
 @router.get("/{experience_id}", response_model=dict)
-async def get_work_experience(experience_id: int, current_user: dict = Depends(get_current_user)):
+def get_work_experience(experience_id: int, user_id: int = Depends(get_current_user_id)):
     """Get a specific work experience"""
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        cursor.execute("""
-            SELECT * FROM work_experiences WHERE id = %s AND user_id = %s
-        """, (experience_id, current_user['id']))
+    with get_cursor(autocommit=True) as cursor:
+        execute_prepared(cursor, "get_work_experience", f"""
+            SELECT {WORK_EXPERIENCE_COLUMNS} FROM work_experiences WHERE id = $1 AND user_id = $2
+        """, (experience_id, user_id))
 
         experience = cursor.fetchone()
-        cursor.close()
-        conn.close()
-
-        if not experience:
-            raise HTTPException(status_code=404, detail="Work experience not found")
 
-        return experience
+    if not experience:
+        raise HTTPException(status_code=404, detail="Work experience not found")
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return experience
 
 
 @router.patch("/{experience_id}", response_model=dict)
-async def update_work_experience(experience_id: int, update: WorkExperienceUpdate, current_user: dict = Depends(get_current_user)):
+def update_work_experience(experience_id: int, update: WorkExperienceUpdate, user_id: int = Depends(get_current_user_id)):
     """Update a work experience"""
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-        updates = []
-        params = []
-
-        if update.company is not None:
-            updates.append("company = %s")
-            params.append(update.company)
-        if update.title is not None:
-            updates.append("title = %s")
-            params.append(update.title)
-        if update.start_date is not None:
-            updates.append("start_date = %s")
-            params.append(update.start_date)
-        if update.end_date is not None:
-            updates.append("end_date = %s")
-            params.append(update.end_date)
-        if update.is_current is not None:
-            updates.append("is_current = %s")
-            params.append(update.is_current)
-        if update.responsibilities is not None:
-            updates.append("responsibilities = %s")
-            params.append(update.responsibilities)
-
-        if not updates:
+    with get_cursor(dict_rows=False, autocommit=True) as cursor:
+        values = update.model_dump(exclude_none=True)
+        if not values:
             raise HTTPException(status_code=400, detail="No fields to update")
 
-        params.extend([experience_id, current_user['id']])
-        query = f"UPDATE work_experiences SET {', '.join(updates)} WHERE id = %s AND user_id = %s RETURNING id"
+        statement_name, query = build_update_sql("work_experiences", tuple(values))
+        execute_prepared(cursor, statement_name, query, (*values.values(), experience_id, user_id))
 
-        cursor.execute(query, params)
-        result = cursor.fetchone()
-
-        if not result:
+        if cursor.rowcount == 0:
             raise HTTPException(status_code=404, detail="Work experience not found")
 
-        conn.commit()
-        cursor.close()
-        conn.close()
-
-        return {"message": "Work experience updated successfully"}
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    invalidate_resume_cache(user_id)
+    return {"message": "Work experience updated successfully"}
 
 
 @router.delete("/{experience_id}", response_model=dict)
-async def delete_work_experience(experience_id: int, current_user: dict = Depends(get_current_user)):
+def delete_work_experience(experience_id: int, user_id: int = Depends(get_current_user_id)):
     """Delete a work experience"""
-    try:
-        conn = get_connection()
-        cursor = conn.cursor()
+    with get_cursor(dict_rows=False, autocommit=True) as cursor:
+        execute_prepared(cursor, "delete_work_experience", "DELETE FROM work_experiences WHERE id = $1 AND user_id = $2", (experience_id, user_id))
 
-        cursor.execute("DELETE FROM work_experiences WHERE id = %s AND user_id = %s RETURNING id", (experience_id, current_user['id']))
-        result = cursor.fetchone()
-
-        if not result:
+        if cursor.rowcount == 0:
             raise HTTPException(status_code=404, detail="Work experience not found")
 
-        conn.commit()
-        cursor.close()
-        conn.close()
-
-        return {"message": "Work experience deleted successfully"}
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    invalidate_resume_cache(user_id)
+    return {"message": "Work experience deleted successfully"}
@@ -1,4 +1,4 @@
-from .database import get_connection
+from .database import get_connection, get_cursor
 from .scraper import fetch_jobs, find_hiring_companies
 from .resume_ai import get_user_resume_data, analyze_resume_match, tailor_resume
 from .resume_generator import generate_resume, generate_tailored_resume
@@ -0,0 +1,163 @@
+import redis
+import json
+import os
+import threading
+import time
+from cachetools import TTLCache
+from dotenv import load_dotenv
+
+load_dotenv()
+
+REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+
+# Don't retry a failed Redis connection on every call - hot paths (auth)
+# would otherwise pay the connect timeout on each request
+RECONNECT_INTERVAL_SECONDS = 30
+
+USER_CACHE_TTL_SECONDS = 5 * 60  # 5 minutes
+
+# Per-process copy of recently seen user rows in front of Redis, so most
+# authenticated requests skip the Redis round trip as well. Kept short because
+# invalidate_user_cache() can only clear the copy in the current process.
+LOCAL_USER_CACHE_TTL_SECONDS = 60
+
+_local_users = TTLCache(maxsize=10_000, ttl=LOCAL_USER_CACHE_TTL_SECONDS)
+_local_users_lock = threading.Lock()
+
+# Per-process copy of a user's assembled resume data (profile row plus all
+# four sections) for the AI endpoints, which are often called repeatedly
+# while a user iterates on a job. Same cross-process caveat as above.
+RESUME_CACHE_TTL_SECONDS = 30
+
+_local_resumes = TTLCache(maxsize=10_000, ttl=RESUME_CACHE_TTL_SECONDS)
+_local_resumes_lock = threading.Lock()
+
+# Shared per-user resume version, changed on every invalidation; the resume
+# endpoint derives its ETag from it so unchanged resumes revalidate with a 304.
+# Versions expire so an invalidation lost while Redis was unreachable can
+# only keep a stale ETag alive for a bounded time
+RESUME_VERSION_PREFIX = "resume_version:"
+RESUME_VERSION_TTL_SECONDS = 5 * 60
+
+_redis_client = None
+_last_failure = 0.0
+
+
+def get_redis():
+    """Get or create the shared Redis connection, or None if Redis is unavailable"""
+    global _redis_client, _last_failure
+    if _redis_client is None:
+        if time.monotonic() - _last_failure < RECONNECT_INTERVAL_SECONDS:
+            return None
+        try:
+            client = redis.from_url(REDIS_URL, decode_responses=True, socket_connect_timeout=2)
+            client.ping()
+            _redis_client = client
+        except redis.RedisError as e:
+            print(f"Redis connection failed: {e}")
+            _last_failure = time.monotonic()
+            return None
+    return _redis_client
+
+
+def cache_get(key):
+    r = get_redis()
+    if r is None:
+        return None
+    try:
+        cached_data = r.get(key)
+        if cached_data:
+            return json.loads(cached_data)
+    except redis.RedisError as e:
+        print(f"Redis get error: {e}")
+    return None
+
+
+def cache_set(key, value, ttl):
+    r = get_redis()
+    if r is None:
+        return
+    try:
+        r.setex(key, ttl, json.dumps(value, default=str))
+    except redis.RedisError as e:
+        print(f"Redis set error: {e}")
+
+
+def cache_delete(*keys):
+    r = get_redis()
+    if r is None:
+        return
+    try:
+        r.delete(*keys)
+    except redis.RedisError as e:
+        print(f"Redis delete error: {e}")
+
+
+def user_cache_key(user_id: int) -> str:
+    # Versioned so rows cached before github/linkedin were selected aren't reused
+    return f"user:v2:{user_id}"
+
+
+def get_cached_user(user_id: int):
+    """Cached user row from the in-process cache, then Redis; None on a miss"""
+    with _local_users_lock:
+        user = _local_users.get(user_id)
+    if user is not None:
+        return user
+
+    user = cache_get(user_cache_key(user_id))
+    if user is not None:
+        with _local_users_lock:
+            _local_users[user_id] = user
+    return user
+
+
+def set_cached_user(user_id: int, user: dict):
+    with _local_users_lock:
+        _local_users[user_id] = user
+    cache_set(user_cache_key(user_id), user, USER_CACHE_TTL_SECONDS)
+
+
+def invalidate_user_cache(user_id: int):
+    """Drop the cached auth row (and resume data) for a user after their profile changes"""
+    with _local_users_lock:
+        _local_users.pop(user_id, None)
+    invalidate_resume_cache(user_id)
+    cache_delete(user_cache_key(user_id))
+
+
+def get_cached_resume(user_id: int):
+    with _local_resumes_lock:
+        return _local_resumes.get(user_id)
+
+
+def set_cached_resume(user_id: int, resume: dict):
+    with _local_resumes_lock:
+        _local_resumes[user_id] = resume
+
+
+def invalidate_resume_cache(user_id: int):
+    """Drop the cached resume data for a user after any of its sections change"""
+    with _local_resumes_lock:
+        _local_resumes.pop(user_id, None)
+    cache_delete(RESUME_VERSION_PREFIX + str(user_id))
+
+
+def get_resume_version(user_id: int):
+    """Current resume version for a user, or None if Redis is unavailable"""
+    r = get_redis()
+    if r is None:
+        return None
+    key = RESUME_VERSION_PREFIX + str(user_id)
+    try:
+        # A missing version (new user, invalidated, evicted) gets a fresh
+        # unique value, so an ETag issued before can never match again. Both
+        # commands go out in one pipeline - a single round trip
+        pipe = r.pipeline(transaction=False)
+        pipe.set(key, time.time_ns(), nx=True, ex=RESUME_VERSION_TTL_SECONDS)
+        pipe.get(key)
+        _, version = pipe.execute()
+        return version
+    except redis.RedisError as e:
+        print(f"Redis get error: {e}")
+        return None
@@ -1,18 +1,50 @@
 import psycopg2
+import psycopg2.extensions
+from psycopg2 import sql
+from psycopg2.pool import ThreadedConnectionPool, PoolError
 from psycopg2.extras import RealDictCursor
+from contextlib import contextmanager
+from functools import lru_cache
 from dotenv import load_dotenv
 import os
+import hashlib
+import threading
+import orjson
 
-import os
 from urllib.parse import urlparse
 
-def get_connection():
+load_dotenv()
+
+DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', '5'))
+DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', '20'))
+DB_POOL_TIMEOUT_SECONDS = 30
+
+_pool = None
+_pool_lock = threading.Lock()
+# ThreadedConnectionPool raises instead of waiting when it is exhausted,
+# so callers queue on this semaphore for a free slot first
+_pool_slots = threading.BoundedSemaphore(DB_POOL_MAX_SIZE)
+
+
+class PooledConnection(psycopg2.extensions.connection):
+    """
+    Connection that remembers which server-side statements it has PREPAREd.
+    Its cursors are RealDictCursors unless a tuple cursor is asked for.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cursor_factory = RealDictCursor
+        self.prepared_statements = set()
+
+
+def _connection_params() -> dict:
     database_url = os.getenv('DATABASE_URL')
-    
+
     if database_url:
         # Parse DATABASE_URL
         url = urlparse(database_url)
-        return psycopg2.connect(
+        return dict(
             dbname=url.path[1:],
             user=url.username,
             password=url.password,
@@ -21,10 +53,175 @@ def get_connection():
         )
     else:
         # Fallback to individual vars
-        return psycopg2.connect(
+        return dict(
             dbname=os.getenv('DB_NAME'),
             user=os.getenv('DB_USER'),
             password=os.getenv('DB_PASSWORD'),
             host=os.getenv('DB_HOST'),
             port=os.getenv('DB_PORT')
-        )
\ No newline at end of file
+        )
+
+
+def init_pool() -> ThreadedConnectionPool:
+    """Create the shared connection pool (no-op if it already exists)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadedConnectionPool(
+                DB_POOL_MIN_SIZE,
+                DB_POOL_MAX_SIZE,
+                connection_factory=PooledConnection,
+                **_connection_params()
+            )
+    return _pool
+
+
+def close_pool():
+    """Close every connection held by the shared pool"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+
+
+@contextmanager
+def get_connection():
+    """
+    Borrow a connection from the shared pool and hand it back afterwards.
+    Any open transaction is rolled back on return so the next borrower
+    starts clean; broken connections are discarded instead of reused.
+    """
+    if not _pool_slots.acquire(timeout=DB_POOL_TIMEOUT_SECONDS):
+        raise PoolError("Timed out waiting for a database connection")
+
+    pool = _pool or init_pool()
+    conn = None
+    try:
+        conn = pool.getconn()
+        yield conn
+    finally:
+        if conn is not None:
+            discard = bool(conn.closed)
+            if not discard:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    discard = True
+            pool.putconn(conn, close=discard)
+        _pool_slots.release()
+
+
+@contextmanager
+def get_cursor(dict_rows: bool = True, autocommit: bool = False):
+    """
+    Borrow a pooled connection and yield a cursor on it (RealDictCursor by
+    default). The transaction is committed when the block exits cleanly and
+    rolled back if it raises; the cursor is always closed.
+
+    With `autocommit=True` the connection runs in autocommit mode for the
+    block, so each statement commits on its own and psycopg2 skips the
+    separate BEGIN and COMMIT round trips. Use it for blocks that run a
+    single statement - plain SELECTs, or one INSERT/UPDATE/DELETE.
+    """
+    with get_connection() as conn:
+        if autocommit:
+            conn.autocommit = True
+        # None picks the connection's RealDictCursor default
+        cursor = conn.cursor(cursor_factory=None if dict_rows else psycopg2.extensions.cursor)
+        try:
+            yield cursor
+            if not autocommit:
+                conn.commit()
+        finally:
+            cursor.close()
+            if autocommit and not conn.closed:
+                conn.autocommit = False
+
+
+def fetchall_dicts(cursor) -> list:
+    """
+    Fetch every row of a plain (tuple) cursor as dicts keyed by column name.
+    Cheaper than RealDictCursor for long results: the column names are read
+    once instead of per row.
+    """
+    columns = [column.name for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+@lru_cache(maxsize=128)
+def build_update_sql(table: str, fields: tuple) -> tuple:
+    """
+    Prepared-statement name and UPDATE statement (for execute_prepared)
+    setting `fields` on the caller's own row of `table`, composed once per
+    column combination. Parameters are the field values, then id and user_id.
+    Callers detect a missing row from cursor.rowcount.
+    """
+    assignments = sql.SQL(", ").join(
+        sql.SQL("{} = ${}").format(sql.Identifier(field), sql.SQL(str(position)))
+        for position, field in enumerate(fields, start=1)
+    )
+    query = sql.SQL("UPDATE {} SET {} WHERE id = ${} AND user_id = ${}").format(
+        sql.Identifier(table),
+        assignments,
+        sql.SQL(str(len(fields) + 1)),
+        sql.SQL(str(len(fields) + 2))
+    )
+    # Field lists can outgrow Postgres' 63-character identifier limit, so the
+    # statement name carries a digest of them instead
+    digest = hashlib.blake2b(",".join(fields).encode(), digest_size=6).hexdigest()
+    return f"update_{table}_{digest}", query
+
+
+def iter_row_batches(query: str, params, batch_size: int = 500):
+    """
+    Run `query` on a server-side (named) cursor and yield its rows as lists of
+    up to `batch_size` dicts, so large results are never held in memory at
+    once. The pooled connection is held until the generator is exhausted or
+    closed. Rows are fetched as tuples and zipped with the column names, which
+    are looked up once per query rather than once per row.
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor(name="row_batches", cursor_factory=psycopg2.extensions.cursor)
+        try:
+            cursor.execute(query, params)
+            columns = None
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                if columns is None:
+                    # A named cursor only has a description after its first fetch
+                    columns = [column.name for column in cursor.description]
+                yield [dict(zip(columns, row)) for row in rows]
+        finally:
+            cursor.close()
+
+
+def json_array_chunks(first_batch: list, batches):
+    """Encode row batches (see iter_row_batches) as one JSON array, a batch per chunk"""
+    yield b"[" + orjson.dumps(first_batch)[1:-1]
+    separator = b"," if first_batch else b""
+    for batch in batches:
+        yield separator + orjson.dumps(batch)[1:-1]
+        separator = b","
+    yield b"]"
+
+
+def execute_prepared(cursor, name: str, query: str, params: tuple):
+    """
+    Execute `query` (written with $1, $2... placeholders, as a string or a
+    psycopg2.sql composition) as the server-side prepared statement `name`.
+    The statement is PREPAREd the first time a pooled connection runs it, so
+    Postgres parses and plans it once per connection instead of on every
+    request.
+    """
+    conn = cursor.connection
+    if name not in conn.prepared_statements:
+        if isinstance(query, sql.Composable):
+            query = query.as_string(conn)
+        cursor.execute(f"PREPARE {name} AS {query}")
+        conn.prepared_statements.add(name)
+
+    placeholders = ", ".join(["%s"] * len(params))
+    cursor.execute(f"EXECUTE {name} ({placeholders})", params)
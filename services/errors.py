@@ -0,0 +1,45 @@
+import logging
+from fastapi import Request
+from fastapi.responses import ORJSONResponse
+from .rate_limiter import ALLOWED_ORIGINS
+
+logger = logging.getLogger(__name__)
+
+
+class NotFoundError(LookupError):
+    """Raised by services when a record the caller asked for doesn't exist"""
+
+
+def _cors_headers(request: Request) -> dict:
+    # Exception handlers run outside CORSMiddleware, so add its headers here
+    origin = request.headers.get("origin", "")
+    if origin in ALLOWED_ORIGINS:
+        return {
+            "Access-Control-Allow-Origin": origin,
+            "Access-Control-Allow-Credentials": "true",
+        }
+    return {}
+
+
+def not_found_handler(request: Request, exc: NotFoundError):
+    """Turn a service-level NotFoundError into a 404 with its message"""
+    return ORJSONResponse(
+        status_code=404,
+        content={"detail": str(exc)},
+        headers=_cors_headers(request)
+    )
+
+
+def internal_error_handler(request: Request, exc: Exception):
+    """
+    Catch-all for unhandled exceptions: log the traceback server-side and
+    return a generic 500 instead of leaking driver/query error text. Runs
+    outside CORSMiddleware, so the CORS headers are added here.
+    """
+    logger.exception("Unhandled error on %s %s", request.method, request.url.path, exc_info=exc)
+
+    return ORJSONResponse(
+        status_code=500,
+        content={"detail": "Internal server error"},
+        headers=_cors_headers(request)
+    )
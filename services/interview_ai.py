@@ -2,12 +2,31 @@ from openai import OpenAI
 import os
 from dotenv import load_dotenv
 import json
+import hashlib
+from .cache import cache_get, cache_set
 
 load_dotenv()
 
 client = OpenAI(api_key=os.getenv("OPENAI_KEY"))  
 
+# Generated question sets are shared through Redis keyed by a digest of the
+# prompt inputs: starting an interview for a posting someone already practiced
+# for skips the GPT-4o call entirely
+QUESTIONS_CACHE_PREFIX = "interview_questions:v1:"
+QUESTIONS_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+
+def _questions_cache_key(job_description, job_title, num_questions) -> str:
+    digest = hashlib.sha256(json.dumps([job_title, job_description, num_questions]).encode()).hexdigest()
+    return QUESTIONS_CACHE_PREFIX + digest
+
+
 def generate_interview_questions(job_description, job_title, num_questions=5):
+    cache_key = _questions_cache_key(job_description, job_title, num_questions)
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return cached
+
     prompt = f"""
     You are an expert technical interviewer for {job_title}.
 
@@ -56,6 +75,8 @@ def generate_interview_questions(job_description, job_title, num_questions=5):
     )
     
     questions = json.loads(response.choices[0].message.content)
+    if questions.get("questions"):
+        cache_set(cache_key, questions, QUESTIONS_CACHE_TTL_SECONDS)
     return questions
 
 def evaluate_answer(question, answer, job_title, job_description):
@@ -108,81 +129,73 @@ def evaluate_answer(question, answer, job_title, job_description):
 
 def get_overall_feedback(session_id):
     """Generate overall interview performance summary"""
-    from .database import get_connection
-    from psycopg2.extras import RealDictCursor
+    from .database import get_cursor
     
-    conn = get_connection()
-    cursor = conn.cursor(cursor_factory=RealDictCursor)
-    
-    try:
+    with get_cursor() as cursor:
         # Get all questions and answers from session
         cursor.execute("""
             SELECT question_text, user_answer, score, strengths, weaknesses
             FROM interview_questions
             WHERE session_id = %s AND user_answer IS NOT NULL
         """, (session_id,))
-        
+
         questions_data = cursor.fetchall()
-        
-        if not questions_data:
-            return {"error": "No answered questions found"}
-        
-        # Calculate average score
-        avg_score = sum(q['score'] for q in questions_data if q['score']) / len(questions_data)
-        
-        # Prepare summary for AI
-        summary_text = f"""
-        Interview Performance Summary:
-        - Total Questions: {len(questions_data)}
-        - Average Score: {avg_score:.1f}/10
-        
-        Questions and Performance:
-        """
-        
-        for i, q in enumerate(questions_data, 1):
-            summary_text += f"""
-            Q{i}: {q['question_text']}
-            Answer: {q['user_answer'][:200]}...
-            Score: {q['score']}/10
-            """
-        
-        # Get AI overall assessment
-        prompt = f"""
-        You are a senior interviewer providing final feedback on a candidate's interview performance.
-        
-        {summary_text}
-        
-        Provide an overall assessment including:
-        1. Overall performance summary
-        2. Top 3 strengths across all answers
-        3. Top 3 areas for improvement
-        4. Specific recommendations for interview preparation
-        5. Overall readiness rating (Not Ready / Needs Work / Ready / Highly Ready)
-        
-        Respond in this exact JSON format:
-        {{
-            "average_score": {avg_score},
-            "overall_summary": "brief summary paragraph",
-            "top_strengths": ["strength 1", "strength 2", "strength 3"],
-            "top_improvements": ["improvement 1", "improvement 2", "improvement 3"],
-            "recommendations": ["rec 1", "rec 2", "rec 3"],
-            "readiness": "Ready"
-        }}
+
+    if not questions_data:
+        return {"error": "No answered questions found"}
+
+    # Calculate average score
+    avg_score = sum(q['score'] for q in questions_data if q['score']) / len(questions_data)
+
+    # Prepare summary for AI
+    summary_text = f"""
+    Interview Performance Summary:
+    - Total Questions: {len(questions_data)}
+    - Average Score: {avg_score:.1f}/10
+
+    Questions and Performance:
+    """
+
+    for i, q in enumerate(questions_data, 1):
+        summary_text += f"""
+        Q{i}: {q['question_text']}
+        Answer: {q['user_answer'][:200]}...
+        Score: {q['score']}/10
         """
-        
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are a senior interviewer providing comprehensive feedback. Respond with valid JSON."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            response_format={"type": "json_object"}
-        )
-        
-        overall_feedback = json.loads(response.choices[0].message.content)
-        return overall_feedback
-        
-    finally:
-        cursor.close()
-        conn.close()
\ No newline at end of file
+
+    # Get AI overall assessment
+    prompt = f"""
+    You are a senior interviewer providing final feedback on a candidate's interview performance.
+
+    {summary_text}
+
+    Provide an overall assessment including:
+    1. Overall performance summary
+    2. Top 3 strengths across all answers
+    3. Top 3 areas for improvement
+    4. Specific recommendations for interview preparation
+    5. Overall readiness rating (Not Ready / Needs Work / Ready / Highly Ready)
+
+    Respond in this exact JSON format:
+    {{
+        "average_score": {avg_score},
+        "overall_summary": "brief summary paragraph",
+        "top_strengths": ["strength 1", "strength 2", "strength 3"],
+        "top_improvements": ["improvement 1", "improvement 2", "improvement 3"],
+        "recommendations": ["rec 1", "rec 2", "rec 3"],
+        "readiness": "Ready"
+    }}
+    """
+
+    response = client.chat.completions.create(
+        model="gpt-4o",
+        messages=[
+            {"role": "system", "content": "You are a senior interviewer providing comprehensive feedback. Respond with valid JSON."},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.7,
+        response_format={"type": "json_object"}
+    )
+
+    overall_feedback = json.loads(response.choices[0].message.content)
+    return overall_feedback
\ No newline at end of file
@@ -1,5 +1,4 @@
 from slowapi import Limiter
-from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 from fastapi import Request
@@ -25,20 +24,30 @@ def _check_redis(url: str) -> bool:
 STORAGE_URI = REDIS_URL if _check_redis(REDIS_URL) else "memory://"
 
 
+def get_client_ip(request: Request) -> str:
+    """
+    Client IP address for rate limiting. Used on its own for the
+    unauthenticated auth endpoints, where keying on a token would let a client
+    reset its limit by rotating tokens.
+    """
+    forwarded = request.headers.get("X-Forwarded-For")
+    if forwarded:
+        return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
 def get_identifier(request: Request) -> str:
     """
     Get identifier for rate limiting.
     Uses user ID if authenticated, otherwise falls back to IP address.
     """
-    # Check if user is authenticated (from JWT middleware)
-    if hasattr(request.state, 'user') and request.state.user:
-        return f"user:{request.state.user.get('id', get_remote_address(request))}"
+    # Check if user is authenticated (token decoded by AuthMiddleware)
+    user_id = getattr(request.state, 'user_id', None)
+    if user_id is not None:
+        return f"user:{user_id}"
 
     # Fall back to IP address
-    forwarded = request.headers.get("X-Forwarded-For")
-    if forwarded:
-        return forwarded.split(",")[0].strip()
-    return request.client.host if request.client else "unknown"
+    return get_client_ip(request)
 
 
 # Create limiter - use Redis if available, otherwise fall back to in-memory
@@ -8,76 +8,94 @@
 from openai import OpenAI
 import os
 from dotenv import load_dotenv
-from .database import get_connection
-from psycopg2.extras import RealDictCursor
+from .database import get_cursor
+from .cache import get_cached_resume, set_cached_resume
+from .errors import NotFoundError
+from datetime import date
+from cachetools import TTLCache
+import hashlib
+import threading
 import json
+import orjson
 
 load_dotenv()
 
 client = OpenAI(api_key=os.getenv("OPENAI_KEY"))
 
+SECTIONS = ("work_experiences", "education", "skills", "projects")
+DATE_FIELDS = ("start_date", "end_date")
+
+# Model answers keyed by a digest of everything that goes into the prompt, so
+# re-running an analysis or tailoring for the same resume and job (a common
+# double-click / re-download pattern) doesn't pay for another GPT-4o call.
+# Any change to the resume data changes the digest.
+_ai_results = TTLCache(maxsize=1024, ttl=60 * 60)
+_ai_results_lock = threading.Lock()
+
+
+def _ai_cache_key(*parts) -> bytes:
+    return hashlib.blake2b(orjson.dumps(parts), digest_size=16).digest()
+
+
+def _parse_section_dates(rows: list) -> list:
+    """json_agg hands dates back as ISO strings; turn them into date objects again"""
+    for row in rows:
+        for field in DATE_FIELDS:
+            if row.get(field):
+                row[field] = date.fromisoformat(row[field])
+    return rows
+
+
 def get_user_resume_data(user_id: int) -> dict:
-    """Fetch all user resume data from database"""
-    conn = get_connection()
-    cursor = conn.cursor(cursor_factory=RealDictCursor)
-    
-    try:
-        # Get user info
-        cursor.execute("SELECT * FROM users WHERE id = %s", (user_id,))
-        user = cursor.fetchone()
-        
-        if not user:
-            raise ValueError("User not found")
-        
-        # Get work experiences
-        cursor.execute("""
-            SELECT * FROM work_experiences 
-            WHERE user_id = %s 
-            ORDER BY start_date DESC
-        """, (user_id,))
-        work_experiences = cursor.fetchall()
-        
-        # Get education
-        cursor.execute("""
-            SELECT * FROM education 
-            WHERE user_id = %s 
-            ORDER BY end_date DESC NULLS FIRST
-        """, (user_id,))
-        education = cursor.fetchall()
-        
-        # Get skills
-        cursor.execute("""
-            SELECT * FROM skills 
-            WHERE user_id = %s
-        """, (user_id,))
-        skills = cursor.fetchall()
-        
-        # Get projects
+    """Fetch all user resume data from database (cached briefly per process)"""
+    cached = get_cached_resume(user_id)
+    if cached is not None:
+        return cached
+
+    with get_cursor(autocommit=True) as cursor:
+        # User row and all four sections in one round trip
         cursor.execute("""
-            SELECT * FROM projects 
-            WHERE user_id = %s 
-            ORDER BY start_date DESC NULLS LAST
+            SELECT u.id, u.email, u.name, u.phone, u.location, u.headline, u.summary,
+                u.github, u.linkedin, u.created_at,
+                (SELECT COALESCE(json_agg(w ORDER BY w.start_date DESC), '[]')
+                 FROM work_experiences w WHERE w.user_id = u.id) AS work_experiences,
+                (SELECT COALESCE(json_agg(e ORDER BY e.end_date DESC NULLS FIRST), '[]')
+                 FROM education e WHERE e.user_id = u.id) AS education,
+                (SELECT COALESCE(json_agg(s), '[]')
+                 FROM skills s WHERE s.user_id = u.id) AS skills,
+                (SELECT COALESCE(json_agg(p ORDER BY p.start_date DESC NULLS LAST), '[]')
+                 FROM projects p WHERE p.user_id = u.id) AS projects
+            FROM users u
+            WHERE u.id = %s
         """, (user_id,))
-        projects = cursor.fetchall()
-        
-        return {
-            "user": dict(user),
-            "work_experiences": [dict(w) for w in work_experiences],
-            "education": [dict(e) for e in education],
-            "skills": [dict(s) for s in skills],
-            "projects": [dict(p) for p in projects]
-        }
-        
-    finally:
-        cursor.close()
-        conn.close()
+        row = cursor.fetchone()
+
+    if not row:
+        raise NotFoundError("User not found")
+
+    user = dict(row)
+    sections = {name: user.pop(name) for name in SECTIONS}
+    resume = {
+        "user": user,
+        "work_experiences": _parse_section_dates(sections["work_experiences"]),
+        "education": _parse_section_dates(sections["education"]),
+        "skills": sections["skills"],
+        "projects": _parse_section_dates(sections["projects"])
+    }
+    set_cached_resume(user_id, resume)
+    return resume
 
 def analyze_resume_match(user_data: dict, job_description: str) -> dict:
     """
     Analyze how well the resume matches the job description
     Returns match score and suggestions
     """
-    
+    cache_key = _ai_cache_key("analyze", user_data, job_description)
+    with _ai_results_lock:
+        cached = _ai_results.get(cache_key)
+    if cached is not None:
+        return cached
+
     # Format user data for prompt
     user_summary = f"""
     Name: {user_data['user']['name']}
@@ -134,6 +152,8 @@ def analyze_resume_match(user_data: dict, job_description: str) -> dict:
     )
     
     analysis = json.loads(response.choices[0].message.content)
+    with _ai_results_lock:
+        _ai_results[cache_key] = analysis
     return analysis
 
 def tailor_resume(user_data: dict, job_description: str, job_title: str) -> dict:
@@ -141,6 +161,27 @@ def tailor_resume(user_data: dict, job_description: str, job_title: str) -> dict
     Generate tailored resume content based on job description
     Returns complete tailored resume data for document generation
     """
+    cache_key = _ai_cache_key("tailor", user_data, job_description, job_title)
+    with _ai_results_lock:
+        tailored_content = _ai_results.get(cache_key)
+    if tailored_content is None:
+        tailored_content = _generate_tailored_content(user_data, job_description, job_title)
+        with _ai_results_lock:
+            _ai_results[cache_key] = tailored_content
+
+    # Merge tailored content with original user data for complete resume generation
+    return {
+        "user": user_data['user'],
+        "education": user_data['education'],
+        "original_work_experiences": user_data['work_experiences'],
+        "original_projects": user_data['projects'],
+        "original_skills": user_data['skills'],
+        "tailored": tailored_content
+    }
+
+
+def _generate_tailored_content(user_data: dict, job_description: str, job_title: str) -> dict:
+    """Ask the model to rephrase the resume content for the job"""
 
     user_summary = f"""
     Current Resume Data:
@@ -216,17 +257,7 @@ def tailor_resume(user_data: dict, job_description: str, job_title: str) -> dict
         response_format={"type": "json_object"}
     )
 
-    tailored_content = json.loads(response.choices[0].message.content)
-
-    # Merge tailored content with original user data for complete resume generation
-    return {
-        "user": user_data['user'],
-        "education": user_data['education'],
-        "original_work_experiences": user_data['work_experiences'],
-        "original_projects": user_data['projects'],
-        "original_skills": user_data['skills'],
-        "tailored": tailored_content
-    }
+    return json.loads(response.choices[0].message.content)
 
 # Helper formatting functions
 def format_work_experience(work_experiences):
@@ -5,12 +5,13 @@ from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
 from datetime import date
 import psycopg2
-from psycopg2.extras import RealDictCursor
-from .database import get_connection
+from .database import get_cursor
+from .errors import NotFoundError
 import io
 
 
 FONT_NAME = 'Arial'
+DOCX_CHUNK_SIZE = 64 * 1024
 
 
 def format_date_month_year(date_obj):
@@ -420,22 +421,24 @@ def generate_resume(user_id: int) -> io.BytesIO:
     Generate a clean, ATS-safe Big Tech resume as DOCX.
     No icons, no symbols, no fluff.
     """
-    conn = get_connection()
-    cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-    try:
-        cursor.execute("SELECT * FROM users WHERE id = %s", (user_id,))
+    with get_cursor() as cursor:
+        cursor.execute("""
+            SELECT id, email, name, phone, location, headline, summary, github, linkedin
+            FROM users WHERE id = %s
+        """, (user_id,))
         user = cursor.fetchone()
         if not user:
-            raise ValueError("User not found")
+            raise NotFoundError("User not found")
 
         cursor.execute("""
-            SELECT * FROM work_experiences
+            SELECT id, company, title, start_date, end_date, is_current, responsibilities
+            FROM work_experiences
             WHERE user_id = %s
             ORDER BY is_current DESC, start_date DESC
         """, (user_id,))
         work_experiences = cursor.fetchall()
 
+        # Whole rows: the education builder also renders an optional description
         cursor.execute("""
             SELECT * FROM education
             WHERE user_id = %s
@@ -444,21 +447,19 @@ def generate_resume(user_id: int) -> io.BytesIO:
         education = cursor.fetchall()
 
         cursor.execute("""
-            SELECT * FROM skills
+            SELECT id, skill_name, proficiency FROM skills
             WHERE user_id = %s
             ORDER BY skill_name ASC
         """, (user_id,))
         skills = cursor.fetchall()
 
         cursor.execute("""
-            SELECT * FROM projects
+            SELECT id, title, description, technologies, url, start_date, end_date
+            FROM projects
             WHERE user_id = %s
             ORDER BY start_date DESC NULLS LAST
         """, (user_id,))
         projects = cursor.fetchall()
-    finally:
-        cursor.close()
-        conn.close()
 
     document = create_base_document()
 
@@ -556,3 +557,13 @@ def generate_tailored_resume(tailored_data: dict, job_title: str) -> io.BytesIO:
     document.save(file_stream)
     file_stream.seek(0)
     return file_stream
+
+
+def iter_docx_chunks(file_stream: io.BytesIO):
+    """
+    Yield a generated document in fixed-size chunks for StreamingResponse
+    (iterating a BytesIO directly splits it on newline bytes instead)
+    """
+    file_stream.seek(0)
+    while chunk := file_stream.read(DOCX_CHUNK_SIZE):
+        yield chunk
@@ -4,8 +4,9 @@ import os
 import io
 import json
 from dotenv import load_dotenv
-from .database import get_connection
-from psycopg2.extras import RealDictCursor
+from .database import get_cursor
+from .cache import invalidate_user_cache
+from psycopg2.extras import execute_values
 
 load_dotenv()
 
@@ -103,10 +104,7 @@ def parse_resume_with_ai(resume_text: str) -> dict:
 
 def save_parsed_resume_data(user_id: int, parsed_data: dict) -> dict:
     """Save AI-parsed resume data into the database tables, replacing existing data"""
-    conn = get_connection()
-    cursor = conn.cursor(cursor_factory=RealDictCursor)
-
-    try:
+    with get_cursor() as cursor:
         # Clear existing profile data for this user
         cursor.execute("DELETE FROM work_experiences WHERE user_id = %s", (user_id,))
         cursor.execute("DELETE FROM education WHERE user_id = %s", (user_id,))
@@ -123,13 +121,9 @@ def save_parsed_resume_data(user_id: int, parsed_data: dict) -> dict:
                 user_id
             ))
 
-        # Insert work experiences
-        work_count = 0
-        for work in parsed_data.get("work_experiences", []):
-            cursor.execute("""
-                INSERT INTO work_experiences (user_id, company, title, start_date, end_date, is_current, responsibilities)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """, (
+        # One multi-row INSERT per section instead of a round trip per row
+        work_rows = [
+            (
                 user_id,
                 work.get("company"),
                 work.get("title"),
@@ -137,16 +131,17 @@ def save_parsed_resume_data(user_id: int, parsed_data: dict) -> dict:
                 work.get("end_date"),
                 work.get("is_current", False),
                 work.get("responsibilities")
-            ))
-            work_count += 1
+            )
+            for work in parsed_data.get("work_experiences", [])
+        ]
+        if work_rows:
+            execute_values(cursor, """
+                INSERT INTO work_experiences (user_id, company, title, start_date, end_date, is_current, responsibilities)
+                VALUES %s
+            """, work_rows)
 
-        # Insert education
-        edu_count = 0
-        for edu in parsed_data.get("education", []):
-            cursor.execute("""
-                INSERT INTO education (user_id, school, degree, field_of_study, start_date, end_date, gpa)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """, (
+        edu_rows = [
+            (
                 user_id,
                 edu.get("school"),
                 edu.get("degree"),
@@ -154,29 +149,31 @@ def save_parsed_resume_data(user_id: int, parsed_data: dict) -> dict:
                 edu.get("start_date"),
                 edu.get("end_date"),
                 edu.get("gpa")
-            ))
-            edu_count += 1
+            )
+            for edu in parsed_data.get("education", [])
+        ]
+        if edu_rows:
+            execute_values(cursor, """
+                INSERT INTO education (user_id, school, degree, field_of_study, start_date, end_date, gpa)
+                VALUES %s
+            """, edu_rows)
 
-        # Insert skills
-        skill_count = 0
-        for skill in parsed_data.get("skills", []):
-            cursor.execute("""
-                INSERT INTO skills (user_id, skill_name, proficiency)
-                VALUES (%s, %s, %s)
-            """, (
+        skill_rows = [
+            (
                 user_id,
                 skill.get("skill_name"),
                 skill.get("proficiency")
-            ))
-            skill_count += 1
+            )
+            for skill in parsed_data.get("skills", [])
+        ]
+        if skill_rows:
+            execute_values(cursor, """
+                INSERT INTO skills (user_id, skill_name, proficiency)
+                VALUES %s
+            """, skill_rows)
 
-        # Insert projects
-        project_count = 0
-        for proj in parsed_data.get("projects", []):
-            cursor.execute("""
-                INSERT INTO projects (user_id, title, description, technologies, url, start_date, end_date)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """, (
+        project_rows = [
+            (
                 user_id,
                 proj.get("title"),
                 proj.get("description"),
@@ -184,21 +181,20 @@ def save_parsed_resume_data(user_id: int, parsed_data: dict) -> dict:
                 proj.get("url"),
                 proj.get("start_date"),
                 proj.get("end_date")
-            ))
-            project_count += 1
-
-        conn.commit()
-
-        return {
-            "work_experiences_added": work_count,
-            "education_added": edu_count,
-            "skills_added": skill_count,
-            "projects_added": project_count
-        }
-
-    except Exception:
-        conn.rollback()
-        raise
-    finally:
-        cursor.close()
-        conn.close()
+            )
+            for proj in parsed_data.get("projects", [])
+        ]
+        if project_rows:
+            execute_values(cursor, """
+                INSERT INTO projects (user_id, title, description, technologies, url, start_date, end_date)
+                VALUES %s
+            """, project_rows)
+
+    invalidate_user_cache(user_id)
+
+    return {
+        "work_experiences_added": len(work_rows),
+        "education_added": len(edu_rows),
+        "skills_added": len(skill_rows),
+        "projects_added": len(project_rows)
+    }
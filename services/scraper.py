@@ -1,4 +1,3 @@
-import redis
 import json
 import hashlib
 import httpx
@@ -6,21 +5,42 @@ from bs4 import BeautifulSoup
 from datetime import datetime, timedelta, timezone
 from urllib.parse import quote_plus, urlparse, parse_qs, unquote
 from dotenv import load_dotenv
-import os
 import re
 import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import TTLCache
+from .cache import get_redis
 
 # Load environment variables
 load_dotenv()
 
-REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
-
-# Redis client
-_redis_client = None
 CACHE_TTL_SECONDS = 2 * 60 * 60  # 2 hours
 CACHE_PREFIX = "job_search:"
 
+# Per-process copy of recent search results in front of Redis: repeat searches
+# skip the Redis round trip, and still skip the scrape when Redis is down
+LOCAL_CACHE_TTL_SECONDS = 10 * 60
+
+_local_results = TTLCache(maxsize=512, ttl=LOCAL_CACHE_TTL_SECONDS)
+_local_results_lock = threading.Lock()
+
+# The job sources of one search are scraped concurrently instead of one after
+# the other; at most MAX_CONCURRENT_SCRAPES searches hit the upstream sites at
+# once so a burst of searches doesn't trip their rate limits. A search waits
+# at most SCRAPE_SLOT_TIMEOUT_SECONDS for a slot, so waiting searches can't
+# pile up and starve the threadpool the other endpoints run on
+MAX_CONCURRENT_SCRAPES = 4
+SCRAPE_SLOT_TIMEOUT_SECONDS = 5
+
+_source_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_SCRAPES * 4, thread_name_prefix="job-source")
+_scrape_slots = threading.BoundedSemaphore(MAX_CONCURRENT_SCRAPES)
+
+
+class ScraperBusyError(RuntimeError):
+    """Raised when no scrape slot frees up within SCRAPE_SLOT_TIMEOUT_SECONDS"""
+
 USER_AGENTS = [
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
@@ -52,40 +72,37 @@ def _get_headers(referer=None):
     return headers
 
 
-def _get_redis():
-    """Get or create Redis connection"""
-    global _redis_client
-    if _redis_client is None:
-        try:
-            _redis_client = redis.from_url(REDIS_URL, decode_responses=True)
-            _redis_client.ping()
-            print("Redis connected successfully")
-        except redis.ConnectionError as e:
-            print(f"Redis connection failed: {e}")
-            return None
-    return _redis_client
-
-
 def _get_cache_key(query, location, date_posted="week", sort_by="date"):
     return f"{CACHE_PREFIX}{query.lower().strip()}|{location.lower().strip()}|{date_posted}|{sort_by}"
 
 
 def _get_cached_jobs(cache_key):
-    r = _get_redis()
+    with _local_results_lock:
+        cached = _local_results.get(cache_key)
+    if cached is not None:
+        return cached
+
+    r = get_redis()
     if r is None:
         return None
     try:
         cached_data = r.get(cache_key)
         if cached_data:
             print(f"Cache hit for: {cache_key}")
-            return json.loads(cached_data)
+            cached = json.loads(cached_data)
+            with _local_results_lock:
+                _local_results[cache_key] = cached
+            return cached
     except Exception as e:
         print(f"Redis get error: {e}")
     return None
 
 
 def _set_cache(cache_key, jobs):
-    r = _get_redis()
+    with _local_results_lock:
+        _local_results[cache_key] = jobs
+
+    r = get_redis()
     if r is None:
         return
     try:
@@ -190,8 +207,10 @@ def _fetch_greenhouse_jobs(company_slug, company_name, query="", location="", ma
             return jobs
 
         data = resp.json()
-        query_lower = query.lower()
+        # Split the filters once - boards can list hundreds of postings
+        query_words = query.lower().split()
         location_lower = location.lower()
+        loc_words = [w.strip() for w in location_lower.split(",") if w.strip()]
 
         for job_data in data.get("jobs", []):
             if len(jobs) >= max_jobs:
@@ -201,14 +220,16 @@ def _fetch_greenhouse_jobs(company_slug, company_name, query="", location="", ma
             job_location = job_data.get("location", {}).get("name", "")
 
             # Filter by query keywords
-            if query_lower and not any(kw in title.lower() for kw in query_lower.split()):
-                continue
+            if query_words:
+                title_lower = title.lower()
+                if not any(kw in title_lower for kw in query_words):
+                    continue
 
             # Filter by location if provided
-            if location_lower and location_lower not in job_location.lower():
+            if location_lower:
+                job_location_lower = job_location.lower()
                 # Also check individual words (e.g. "New York" matches "New York, NY")
-                loc_words = [w for w in location_lower.split(",") if w.strip()]
-                if not any(w.strip() in job_location.lower() for w in loc_words):
+                if location_lower not in job_location_lower and not any(w in job_location_lower for w in loc_words):
                     continue
 
             job_url = job_data.get("absolute_url", "")
@@ -261,8 +282,10 @@ def _fetch_lever_jobs(company_slug, company_name, query="", location="", max_job
             return jobs
 
         data = resp.json()
-        query_lower = query.lower()
+        # Split the filters once - boards can list hundreds of postings
+        query_words = query.lower().split()
         location_lower = location.lower()
+        loc_words = [w.strip() for w in location_lower.split(",") if w.strip()]
 
         for posting in data:
             if len(jobs) >= max_jobs:
@@ -273,17 +296,16 @@ def _fetch_lever_jobs(company_slug, company_name, query="", location="", max_job
             team = posting.get("categories", {}).get("team", "")
 
             # Filter by query keywords
-            if query_lower:
+            if query_words:
                 combined = f"{title} {team}".lower()
-                if not any(kw in combined for kw in query_lower.split()):
+                if not any(kw in combined for kw in query_words):
                     continue
 
             # Filter by location
             if location_lower and job_location:
-                if location_lower not in job_location.lower():
-                    loc_words = [w for w in location_lower.split(",") if w.strip()]
-                    if not any(w.strip() in job_location.lower() for w in loc_words):
-                        continue
+                job_location_lower = job_location.lower()
+                if location_lower not in job_location_lower and not any(w in job_location_lower for w in loc_words):
+                    continue
 
             job_url = posting.get("hostedUrl", "") or posting.get("applyUrl", "")
             description = posting.get("descriptionPlain", "")
@@ -877,39 +899,33 @@ def fetch_jobs(query="software engineer", location="", max_jobs=25, date_posted=
 
     print(f"Fetching jobs for: '{query}' location='{location}' max={max_jobs} days={days}")
 
-    all_jobs = []
-
-    # 1. ATS APIs (Greenhouse + Lever) — most reliable source
-    try:
-        ats_jobs = _scrape_ats_jobs(query, location, max_jobs=per_source, days=days)
-        print(f"ATS (Greenhouse/Lever): fetched {len(ats_jobs)} jobs")
-        all_jobs.extend(ats_jobs)
-    except Exception as e:
-        print(f"ATS fetching failed: {e}")
-
-    # 2. LinkedIn — reliable HTML scraping
-    try:
-        linkedin_jobs = _scrape_linkedin(query, location, max_jobs=per_source, days=days, sort_by=sort_by)
-        print(f"LinkedIn: scraped {len(linkedin_jobs)} jobs")
-        all_jobs.extend(linkedin_jobs)
-    except Exception as e:
-        print(f"LinkedIn scraping failed: {e}")
+    sources = [
+        ("ATS (Greenhouse/Lever)", _scrape_ats_jobs, (query, location), {"max_jobs": per_source, "days": days}),
+        ("LinkedIn", _scrape_linkedin, (query, location), {"max_jobs": per_source, "days": days, "sort_by": sort_by}),
+        ("Indeed", _scrape_indeed, (query, location), {"max_jobs": per_source, "days": days, "sort_by": sort_by}),
+        ("Web/Company pages", _scrape_web_jobs, (query, location), {"max_jobs": per_source, "days": days}),
+    ]
 
-    # 3. Indeed via DuckDuckGo — fallback
-    try:
-        indeed_jobs = _scrape_indeed(query, location, max_jobs=per_source, days=days, sort_by=sort_by)
-        print(f"Indeed: scraped {len(indeed_jobs)} jobs")
-        all_jobs.extend(indeed_jobs)
-    except Exception as e:
-        print(f"Indeed scraping failed: {e}")
+    all_jobs = []
 
-    # 4. Web search via DuckDuckGo — fallback
+    # Scrape all sources at once; results are still collected in source order
+    # (ATS first - most reliable) so deduplication prefers the same copies
+    if not _scrape_slots.acquire(timeout=SCRAPE_SLOT_TIMEOUT_SECONDS):
+        raise ScraperBusyError("Too many job searches in progress")
     try:
-        web_jobs = _scrape_web_jobs(query, location, max_jobs=per_source, days=days)
-        print(f"Web/Company pages: scraped {len(web_jobs)} jobs")
-        all_jobs.extend(web_jobs)
-    except Exception as e:
-        print(f"Web scraping failed: {e}")
+        futures = [
+            (name, _source_executor.submit(scrape, *args, **kwargs))
+            for name, scrape, args, kwargs in sources
+        ]
+        for name, future in futures:
+            try:
+                source_jobs = future.result()
+                print(f"{name}: fetched {len(source_jobs)} jobs")
+                all_jobs.extend(source_jobs)
+            except Exception as e:
+                print(f"{name} scraping failed: {e}")
+    finally:
+        _scrape_slots.release()
 
     # Deduplicate across sources by (title, company)
     seen = set()